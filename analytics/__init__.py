@@ -0,0 +1 @@
+"""Data and query helpers behind the e-commerce analytics dashboard."""
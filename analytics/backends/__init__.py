@@ -0,0 +1,10 @@
+"""Pluggable query engines behind the dashboard.
+
+Every backend implements :class:`~analytics.backends.base.QueryBackend`;
+``config.query_backend`` picks one by name. Backends whose engine is an
+optional dependency import without it and raise ImportError only when
+one is built.
+"""
+
+from analytics.backends.base import Filter, QueryBackend
+from analytics.backends.memory import MemoryBackend
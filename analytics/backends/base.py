@@ -0,0 +1,151 @@
+"""The interface the dashboard queries, whatever engine answers it."""
+
+import datetime
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.time_buckets import epoch_days, range_sums
+
+
+@dataclass(frozen=True)
+class Filter:
+    """A normalised dashboard filter, built by :meth:`QueryBackend.filter`.
+
+    ``start`` and ``end`` are inclusive dates clipped to the data, and
+    ``selections`` is a sorted tuple of ``(column, values)`` pairs where
+    ``values`` is ``None`` when every option is selected. Two spellings of
+    the same view compare equal, so a Filter can key a cache directly.
+    """
+    start: object
+    end: object
+    selections: tuple = ()
+
+    def selected(self):
+        """``{column: values}`` for the columns the filter restricts."""
+        return {name: list(values) for name, values in self.selections if values is not None}
+
+
+class QueryBackend:
+    """Answers the dashboard's filters, KPIs, groupbys and export.
+
+    ``dimension`` is one of Category, Product, Region, LoyaltyTier or
+    Gender. Frames returned by a backend are never mutated by the caller,
+    so they may be cached and shared.
+    """
+
+    name = None
+
+    def options(self):
+        """``{column: values}`` for the Category, Product and Region
+        multiselects."""
+        raise NotImplementedError
+
+    def date_bounds(self):
+        """First and last order date as ``datetime.date``."""
+        raise NotImplementedError
+
+    def filter(self, start=None, end=None, selections=None):
+        """Normalise the sidebar state into a :class:`Filter`; a missing
+        date range means the whole history."""
+        first, last = self.date_bounds()
+        start = first if start is None else max(start, first)
+        end = last if end is None else min(end, last)
+        options = self.options()
+        columns = []
+        for name in sorted(selections or {}):
+            chosen = set(selections[name])
+            values = tuple(value for value in options[name] if value in chosen)
+            columns.append((name, None if len(values) == len(options[name]) else values))
+        return Filter(start, end, tuple(columns))
+
+    def total(self, flt, measure):
+        """Sum of ``measure`` (Revenue, Quantity, Discount or Orders)."""
+        raise NotImplementedError
+
+    def distinct_customers(self, flt, approximate=False):
+        raise NotImplementedError
+
+    def approximate_error(self):
+        """Relative standard error of approximate distinct counts, or
+        ``None`` when the engine does not say."""
+        return None
+
+    def by(self, flt, dimension):
+        """Per-value ``Revenue``, ``Quantity``, mean ``Discount`` and
+        ``Orders``, leaving out values with no orders, in option order."""
+        raise NotImplementedError
+
+    def distinct_customers_by(self, flt, dimension, approximate=False):
+        """Distinct customers per value of ``dimension`` as a Series
+        indexed by value."""
+        raise NotImplementedError
+
+    def trend(self, flt, freq):
+        """Revenue per ``freq`` period of the filter's date range as
+        ``Label``/``Date``/``Revenue`` (see :mod:`analytics.time_buckets`)."""
+        raise NotImplementedError
+
+    def customers(self, flt):
+        """Customer rows of everyone with at least one matching order."""
+        raise NotImplementedError
+
+    def customer_distribution(self, flt, attribute):
+        """Customers with a matching order per value of ``attribute`` (Age,
+        Gender or LoyaltyTier), as a Series named ``count``."""
+        return value_distribution(self.customers(flt)[attribute])
+
+    def orders(self, flt, limit=None):
+        """Matching orders joined with customer attributes, in Date order."""
+        raise NotImplementedError
+
+    def batch(self, flt, calls):
+        """Run several queries on one filter, as ``{call: result}``.
+
+        Each call is a ``(method, *args)`` tuple such as ``('by', 'Region')``.
+        Backends that can plan queries together override this to answer
+        them in one pass.
+        """
+        return {call: getattr(self, call[0])(flt, *call[1:]) for call in calls}
+
+    def memory_usage(self):
+        """``{name: report}`` of the data the engine holds in process
+        memory, each report in the layout of
+        :func:`~analytics.schema.memory_report`; empty when the engine scans
+        its tables from disk and holds nothing."""
+        return {}
+
+
+def date_range(flt):
+    """``(start, stop)`` datetimes bounding the filter's days, half-open so
+    every time of day on the last day is included. Comparing the bare Date
+    column with them lets an engine push the range into its scan."""
+    start = datetime.datetime.combine(flt.start, datetime.time())
+    stop = datetime.datetime.combine(flt.end + datetime.timedelta(days=1), datetime.time())
+    return start, stop
+
+
+def month_range(flt):
+    """First and last ``YYYYMM`` month partition the filter spans, so
+    hive partitions are pruned before any file is opened."""
+    return flt.start.year * 100 + flt.start.month, flt.end.year * 100 + flt.end.month
+
+
+def daily_trend(flt, days, revenue, freq):
+    """The :meth:`QueryBackend.trend` frame from revenue summed per day,
+    where ``days`` counts days since ``flt.start``. Engines only sum per
+    day; bucketing the (at most a few thousand) days into periods is
+    cheaper in numpy than a second pass."""
+    n_days = max((flt.end - flt.start).days + 1, 0)
+    values = np.bincount(np.asarray(days, dtype=np.int64), weights=revenue, minlength=n_days)
+    trend = range_sums(epoch_days(np.datetime64(flt.start)), values[:n_days], freq)
+    return trend.rename(columns={'Value': 'Revenue'})
+
+
+def value_distribution(column):
+    """Counts per value of ``column`` as a Series named ``count``: every
+    category, in category order, for a Categorical, and the values that
+    occur, in ascending order, otherwise."""
+    counts = column.value_counts(sort=False)
+    return counts if isinstance(column.dtype, pd.CategoricalDtype) else counts.sort_index()
@@ -0,0 +1,188 @@
+"""Backend that runs the dashboard's queries as SQL in embedded DuckDB.
+
+The tables are either the date-partitioned Parquet copy, scanned in place so
+the data never has to fit in memory, or in-process frames copied into
+DuckDB's own columnar storage. Each query runs multi-threaded on its own
+cursor, so sessions can query concurrently.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from analytics import storage
+from analytics.backends.base import QueryBackend, daily_trend, date_range, month_range, value_distribution
+from analytics.hll import standard_error
+from analytics.schema import usage_report
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+CUSTOMER_DIMENSIONS = ('LoyaltyTier', 'Gender')
+MEASURES = {
+    'Revenue': 'sum(s.Revenue)',
+    'Quantity': 'sum(s.Quantity)',
+    'Discount': 'sum(s.Discount)',
+    'Orders': 'count(*)',
+}
+FILTER_COLUMNS = ('Category', 'Product', 'Region')
+# approx_count_distinct is a HyperLogLog with a fixed 2**6 registers, so
+# hll_error cannot tighten it
+APPROX_PRECISION = 6
+
+
+class DuckDBBackend(QueryBackend):
+    """``categories`` gives the display order of categorical columns that
+    DuckDB only sees as strings; other columns are listed in SQL order."""
+
+    name = 'duckdb'
+
+    def __init__(self, connection, categories=None):
+        self._con = connection
+        self._categories = categories or {}
+        self._options = {name: self._distinct('sales', name) for name in FILTER_COLUMNS}
+        self._labels = dict(self._options, **{name: self._distinct('customers', name) for name in CUSTOMER_DIMENSIONS})
+        first, last = self._con.execute("SELECT min(Date)::DATE, max(Date)::DATE FROM sales").fetchone()
+        self._bounds = (first, last) if first is not None else (datetime.date(1970, 1, 1),) * 2
+        columns = self._con.table('sales').columns
+        self._partitioned = storage.PARTITION_COLUMN in columns
+        self.sales_columns = [name for name in columns if name not in ('CustomerPos', storage.PARTITION_COLUMN)]
+
+    @classmethod
+    def from_parquet(cls, data_dir, config):
+        """Query the Parquet copy written by :func:`analytics.storage.write_tables`."""
+        path = storage.dataset_path(data_dir, config)
+        con = _connect()
+        sales_glob = str(path / storage.SALES_DIR / '**' / '*.parquet')
+        con.execute(f"CREATE VIEW sales AS SELECT * FROM read_parquet({_quote(sales_glob)}, hive_partitioning = true)")
+        con.execute(f"CREATE VIEW customers AS SELECT * FROM read_parquet({_quote(str(path / storage.CUSTOMERS_FILE))})")
+        return cls(con, storage.read_categories(data_dir, config))
+
+    @classmethod
+    def from_frames(cls, sales_df, customer_df):
+        """Copy in-process frames into an in-memory DuckDB database."""
+        con = _connect()
+        for name, frame in (('sales', sales_df), ('customers', customer_df)):
+            con.register('source', frame)
+            con.execute(f"CREATE TABLE {name} AS SELECT * FROM source")
+            con.unregister('source')
+        return cls(con)
+
+    def _distinct(self, table, column):
+        if column in self._categories:
+            return self._categories[column]
+        # ENUMs (from Categoricals) sort in category order, strings by value
+        rows = self._con.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY 1").fetchall()
+        return [row[0] for row in rows]
+
+    def _query(self, sql, flt, leading=()):
+        # ``leading`` binds any placeholders that come before {where}
+        where, params = _where(flt, self._partitioned)
+        return self._con.cursor().execute(sql.format(where=where), [*leading, *params])
+
+    def _from(self, dimension=None):
+        if dimension in CUSTOMER_DIMENSIONS:
+            return "sales s LEFT JOIN customers c USING (CustomerID)"
+        return "sales s"
+
+    def options(self):
+        return self._options
+
+    def date_bounds(self):
+        return self._bounds
+
+    def approximate_error(self):
+        return standard_error(APPROX_PRECISION)
+
+    def memory_usage(self):
+        # DuckDB accounts its memory by purpose (in-memory tables, Parquet
+        # reader buffers, ...) rather than by column
+        usage = self._con.cursor().execute(
+            "SELECT tag, memory_usage_bytes FROM duckdb_memory() WHERE memory_usage_bytes > 0").fetchall()
+        if not usage:
+            return {}
+        return {'DuckDB': usage_report([tag for tag, _ in usage], ['buffer manager'] * len(usage),
+                                       [size for _, size in usage])}
+
+    def total(self, flt, measure):
+        value = self._query(f"SELECT {MEASURES[measure]} FROM sales s WHERE {{where}}", flt).fetchone()[0]
+        return value or 0
+
+    def distinct_customers(self, flt, approximate=False):
+        return self._query(f"SELECT {_count_customers(approximate)} FROM sales s WHERE {{where}}", flt).fetchone()[0]
+
+    def _grouped(self, flt, dimension, aggregates):
+        key = f"c.{dimension}" if dimension in CUSTOMER_DIMENSIONS else f"s.{dimension}"
+        frame = self._query(
+            f"SELECT {key}::VARCHAR AS {dimension}, {aggregates} FROM {self._from(dimension)} "
+            f"WHERE {{where}} AND {key} IS NOT NULL GROUP BY 1", flt).df()
+        labels = self._labels[dimension]
+        frame[dimension] = pd.Categorical(frame[dimension], categories=labels)
+        return frame.sort_values(dimension, ignore_index=True)
+
+    def by(self, flt, dimension):
+        frame = self._grouped(flt, dimension, ', '.join(f"{sql} AS {name}" for name, sql in MEASURES.items()))
+        frame['Quantity'] = frame['Quantity'].astype(np.int64)
+        frame['Orders'] = frame['Orders'].astype(np.int64)
+        frame['Discount'] = frame['Discount'] / np.maximum(frame['Orders'], 1)
+        return frame[[dimension, *MEASURES]]
+
+    def distinct_customers_by(self, flt, dimension, approximate=False):
+        frame = self._grouped(flt, dimension, f"{_count_customers(approximate)} AS CustomerID")
+        return frame.set_index(dimension)['CustomerID']
+
+    def trend(self, flt, freq):
+        daily = self._query("SELECT datediff('day', ?::DATE, s.Date::DATE) AS day, sum(s.Revenue) AS revenue "
+                            "FROM sales s WHERE {where} GROUP BY 1", flt, leading=[flt.start]).df()
+        return daily_trend(flt, daily['day'].to_numpy(), daily['revenue'].to_numpy(), freq)
+
+    def customers(self, flt):
+        return self._query("SELECT * FROM customers WHERE CustomerID IN "
+                           "(SELECT s.CustomerID FROM sales s WHERE {where}) ORDER BY CustomerID", flt).df()
+
+    def customer_distribution(self, flt, attribute):
+        values = self._query(f"SELECT {attribute} FROM customers WHERE CustomerID IN "
+                             "(SELECT s.CustomerID FROM sales s WHERE {where})", flt).df()[attribute]
+        if attribute in self._labels:
+            values = pd.Categorical(values.astype(str), categories=self._labels[attribute])
+        return value_distribution(pd.Series(values, name=attribute))
+
+    def orders(self, flt, limit=None):
+        columns = ', '.join(f's.{name}' for name in self.sales_columns)
+        sql = (f"SELECT {columns}, c.* EXCLUDE (CustomerID) FROM sales s "
+               f"LEFT JOIN customers c USING (CustomerID) WHERE {{where}} ORDER BY s.Date")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._query(sql, flt).df()
+
+
+def _connect():
+    if duckdb is None:
+        raise ImportError("the duckdb query backend needs the duckdb package (pip install duckdb)")
+    return duckdb.connect()
+
+
+def _count_customers(approximate):
+    # approx_count_distinct is DuckDB's HyperLogLog aggregate
+    return "approx_count_distinct(s.CustomerID)" if approximate else "count(DISTINCT s.CustomerID)"
+
+
+def _quote(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _where(flt, partitioned=False):
+    # list_contains keeps an empty selection valid SQL
+    clauses = ["s.Date >= ? AND s.Date < ?"]
+    params = list(date_range(flt))
+    if partitioned:
+        clauses.append(f"s.{storage.PARTITION_COLUMN} BETWEEN ? AND ?")
+        params += month_range(flt)
+    for name, values in flt.selections:
+        if values is not None:
+            clauses.append(f"list_contains(?::VARCHAR[], s.{name}::VARCHAR)")
+            params.append(list(values))
+    return ' AND '.join(clauses), params
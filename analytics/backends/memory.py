@@ -0,0 +1,174 @@
+"""Backend over the in-process indexes, cube and prefix sums."""
+
+import numpy as np
+import pandas as pd
+
+from analytics.aggregation import GroupBy, aggregate
+from analytics.backends.base import QueryBackend
+from analytics.cube import measure_frame, measures_by
+from analytics.hll import standard_error
+from analytics.presence import CustomerPresence
+from analytics.schema import memory_report
+
+DISTINCT_CUSTOMERS = (('CustomerID', 'nunique', 'CustomerID'),)
+CUSTOMER_ATTRIBUTES = ('LoyaltyTier', 'Gender')
+
+
+class MemoryBackend(QueryBackend):
+    """Sums and counts come from the :class:`~analytics.cube.DailyCube`
+    and the trend from :class:`~analytics.rollups.RevenuePrefixSums`;
+    only exact distinct counts, customer rows and the export touch the
+    fact table, through the date and bitmap indexes. :meth:`batch` folds
+    every total, groupby and exact distinct count of a view into one
+    :func:`~analytics.aggregation.aggregate` pass over the cube cells and
+    one over the matching orders.
+
+    ``sketches`` is called for the customer HyperLogLog sketches the first
+    time an approximate count is asked for; ``sketch_precision`` is the
+    precision they are built with. With a ``cache`` (an
+    :class:`~analytics.filter_cache.LRUCache`), the matching rows and cube
+    cells of each filter are computed once and shared.
+    """
+
+    name = 'memory'
+
+    def __init__(self, star, date_index, bitmap_index, cube, revenue_prefix, sketches, sketch_precision,
+                 cache=None):
+        self.star = star
+        self.date_index = date_index
+        self.bitmap_index = bitmap_index
+        self.cube = cube
+        self.revenue_prefix = revenue_prefix
+        self.sketches = sketches
+        self.sketch_precision = sketch_precision
+        self.cache = cache
+        self._order_columns = _order_columns(star, cube)
+        self.presence = CustomerPresence(star)
+
+    def _cached(self, flt, name, compute):
+        return compute() if self.cache is None else self.cache.get_or_compute((flt, name), compute)
+
+    def _rows(self, flt):
+        return self._cached(flt, 'rows', lambda: self.bitmap_index.select(
+            flt.selected(), self.date_index.slice(flt.start, flt.end)))
+
+    def _cells(self, flt):
+        return self._cached(flt, 'cells', lambda: self.cube.query(flt.start, flt.end, flt.selected()))
+
+    def _active_customers(self, flt):
+        return self._cached(flt, 'active_customers', lambda: self.presence.active(self._rows(flt)))
+
+    def _orders(self, flt):
+        return self.star.sales.iloc[self._rows(flt)]
+
+    def options(self):
+        return self.bitmap_index.values
+
+    def approximate_error(self):
+        return standard_error(self.sketch_precision)
+
+    def date_bounds(self):
+        origin = self.date_index.origin
+        return origin.item(), (origin + max(self.date_index.n_days - 1, 0)).item()
+
+    def batch(self, flt, calls):
+        cell_specs, order_specs, results = {}, {}, {}
+        for call in calls:
+            method, args = call[0], call[1:]
+            if method == 'total':
+                cell_specs[call] = GroupBy(metrics=((args[0], 'sum', args[0]),))
+            elif method == 'by':
+                cell_specs[call] = measures_by(args[0])
+            elif method == 'distinct_customers' and not any(args[:1]):
+                order_specs[call] = GroupBy(metrics=DISTINCT_CUSTOMERS)
+            elif method == 'distinct_customers_by' and not any(args[1:2]) and args[0] in CUSTOMER_ATTRIBUTES:
+                # Customers per tier or gender are read off the presence mask
+                counts = self.customer_distribution(flt, args[0])
+                results[call] = counts[counts > 0].rename('CustomerID')
+            elif method == 'distinct_customers_by' and not any(args[1:2]):
+                order_specs[call] = GroupBy((args[0],), DISTINCT_CUSTOMERS)
+            else:
+                # Approximate counts, the trend, customer rows and the export
+                results[call] = getattr(self, method)(flt, *args)
+
+        if cell_specs:
+            sums = self._cells(flt).aggregate(list(cell_specs.values()))
+            for call, values in zip(cell_specs, sums):
+                if call[0] == 'total':
+                    total = values[call[1]][0]
+                    results[call] = float(total) if call[1] in ('Revenue', 'Discount') else int(total)
+                else:
+                    results[call] = measure_frame(call[1], self.cube.labels[call[1]], values)
+        if order_specs:
+            counts = aggregate(self._order_columns, self.cube.cardinality, list(order_specs.values()), self._rows(flt))
+            for call, values in zip(order_specs, counts):
+                customers = values['CustomerID']
+                results[call] = int(customers[0]) if call[0] == 'distinct_customers' \
+                    else _distinct_series(call[1], self.cube.labels[call[1]], customers)
+        return {call: results[call] for call in calls}
+
+    def _one(self, flt, *call):
+        return self.batch(flt, [call])[call]
+
+    def total(self, flt, measure):
+        return self._one(flt, 'total', measure)
+
+    def distinct_customers(self, flt, approximate=False):
+        if approximate:
+            return self._cells(flt).distinct_customers(self.sketches())
+        return self._one(flt, 'distinct_customers', False)
+
+    def by(self, flt, dimension):
+        return self._one(flt, 'by', dimension)
+
+    def distinct_customers_by(self, flt, dimension, approximate=False):
+        if approximate:
+            return self._cells(flt).distinct_customers_by(self.sketches(), dimension)
+        return self._one(flt, 'distinct_customers_by', dimension, False)
+
+    def trend(self, flt, freq):
+        return self.revenue_prefix.trend(flt.start, flt.end, flt.selected(), freq)
+
+    def customers(self, flt):
+        return self.star.customers.iloc[np.flatnonzero(self._active_customers(flt))]
+
+    def customer_distribution(self, flt, attribute):
+        return self.presence.distribution(self._active_customers(flt), attribute)
+
+    def orders(self, flt, limit=None):
+        orders = self._orders(flt)
+        return self.star.with_customers(orders if limit is None else orders.head(limit))
+
+    def memory_usage(self):
+        return {'Sales': memory_report(self.star.sales), 'Customers': memory_report(self.star.customers)}
+
+
+def _order_columns(star, cube):
+    # Order-level inputs of the aggregation kernel. Tier and gender are
+    # looked up through CustomerPos only for the rows being aggregated, with
+    # the cube's trailing code for orders that have no customer row
+    sales = star.sales
+    positions = sales['CustomerPos'].to_numpy()
+
+    def customer_codes(name):
+        codes = star.customers[name].cat.codes.to_numpy()
+        missing = len(cube.labels[name])
+
+        def at(rows):
+            rows_positions = positions[rows]
+            return np.where(rows_positions >= 0, codes[rows_positions], missing)
+        return at
+
+    columns = {'CustomerID': sales['CustomerID'].to_numpy()}
+    for name in ('Category', 'Product', 'Region'):
+        columns[name] = sales[name].cat.codes.to_numpy()
+    for name in ('LoyaltyTier', 'Gender'):
+        columns[name] = customer_codes(name)
+    return columns
+
+
+def _distinct_series(dimension, labels, counts):
+    # Values with no orders are left out, as in an observed groupby
+    counts = pd.Series(counts[:len(labels)], index=pd.CategoricalIndex(labels, categories=labels, name=dimension),
+                       name='CustomerID')
+    return counts[counts > 0]
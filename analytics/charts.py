@@ -0,0 +1,189 @@
+"""Dashboard charts built with plotly.graph_objects from numpy columns.
+
+``plotly.express`` resolves its template, validates every argument against
+the frame and copies the frame before it builds a single trace, which costs
+more than the few rows the dashboard's charts plot. The builders here take
+the same frame-and-column arguments for the chart types the dashboard draws
+(bar, pie, line and scatter_geo), pull each column out once as a numpy array
+and build the traces with ``go`` directly. Figures are serialized with
+orjson when it is installed.
+"""
+
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.colors import qualitative
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def bar(frame, x, y, color=None, title=None, labels=None, height=None, **layout):
+    """Vertical bars of ``y`` per ``x``. With ``color`` every value of that
+    column gets its own trace, colour and legend entry."""
+    xs = frame[x].to_numpy()
+    ys = frame[y].to_numpy()
+    hover = f'{_label(labels, x)}=%{{x}}<br>{_label(labels, y)}=%{{y}}<extra></extra>'
+    if color is None:
+        traces = [go.Bar(x=xs, y=ys, marker_color=_colors(1)[0], hovertemplate=hover)]
+        axis = {}
+    else:
+        groups = frame[color].to_numpy()
+        values = _in_order(groups)
+        prefix = '' if color == x else f'{_label(labels, color)}=%{{fullData.name}}<br>'
+        traces = [go.Bar(x=xs[groups == value], y=ys[groups == value], name=str(value),
+                         legendgroup=str(value), showlegend=True, marker_color=colour,
+                         hovertemplate=prefix + hover)
+                  for value, colour in zip(values, _colors(len(values)))]
+        # Keep the x order of the frame rather than the order traces are drawn
+        axis = {'categoryorder': 'array', 'categoryarray': list(_in_order(xs))}
+    return go.Figure(traces, _layout(
+        title, height, layout, barmode='relative',
+        xaxis={'title': {'text': _label(labels, x)}, **axis},
+        yaxis={'title': {'text': _label(labels, y)}},
+        legend_title=_label(labels, color) if color else None
+    ))
+
+
+def pie(frame, names, values, hole=None, title=None, labels=None, height=None, **layout):
+    """Share of ``values`` per ``names``, as a donut when ``hole`` is set."""
+    trace = go.Pie(
+        labels=frame[names].to_numpy(),
+        values=frame[values].to_numpy(),
+        hole=hole,
+        hovertemplate=f'{_label(labels, names)}=%{{label}}<br>{_label(labels, values)}=%{{value}}<extra></extra>'
+    )
+    return go.Figure([trace], _layout(title, height, layout))
+
+
+def line(frame, x, y, title=None, labels=None, hover_data=None, height=None, **layout):
+    """A single line of ``y`` over ``x``. ``hover_data`` maps columns to
+    whether they show on hover, as in ``plotly.express``."""
+    hover_data = dict(hover_data or {})
+    parts = []
+    for name, key in ((x, 'x'), (y, 'y')):
+        if hover_data.pop(name, True):
+            parts.append(f'{_label(labels, name)}=%{{{key}}}')
+    extra = [name for name, shown in hover_data.items() if shown]
+    parts += [f'{_label(labels, name)}=%{{customdata[{i}]}}' for i, name in enumerate(extra)]
+    trace = go.Scatter(
+        x=frame[x].to_numpy(),
+        y=frame[y].to_numpy(),
+        mode='lines',
+        line_color=_colors(1)[0],
+        customdata=_stack(frame, extra),
+        hovertemplate='<br>'.join(parts) + '<extra></extra>'
+    )
+    return go.Figure([trace], _layout(
+        title, height, layout,
+        xaxis={'title': {'text': _label(labels, x)}},
+        yaxis={'title': {'text': _label(labels, y)}}
+    ))
+
+
+def scatter_geo(frame, lat, lon, size, color, hover_name=None, hover_data=(), projection=None,
+                title=None, labels=None, height=None, geo=None, size_max=20, **layout):
+    """Markers at ``lat``/``lon`` with area proportional to ``size``, one
+    trace per value of ``color``. ``geo`` holds extra geo layout settings."""
+    groups = frame[color].to_numpy()
+    values = _in_order(groups)
+    sizes = frame[size].to_numpy()
+    lats = frame[lat].to_numpy()
+    lons = frame[lon].to_numpy()
+    names = frame[hover_name].to_numpy() if hover_name else None
+    customdata = _stack(frame, hover_data)
+    hover = '<br>'.join([f'{_label(labels, color)}=%{{fullData.name}}']
+                        + [f'{_label(labels, name)}=%{{customdata[{i}]}}' for i, name in enumerate(hover_data)])
+    if hover_name:
+        hover = '<b>%{hovertext}</b><br><br>' + hover
+    # Same marker scaling as plotly.express: the largest value gets size_max
+    sizeref = float(sizes.max()) / size_max ** 2 if len(sizes) else 0
+    traces = []
+    for value, colour in zip(values, _colors(len(values))):
+        rows = groups == value
+        traces.append(go.Scattergeo(
+            lat=lats[rows],
+            lon=lons[rows],
+            mode='markers',
+            name=str(value),
+            legendgroup=str(value),
+            showlegend=True,
+            hovertext=names[rows] if names is not None else None,
+            customdata=customdata[rows] if customdata is not None else None,
+            hovertemplate=hover + '<extra></extra>',
+            marker={'color': colour, 'size': sizes[rows], 'sizemode': 'area', 'sizeref': sizeref or 1}
+        ))
+    geo = dict(geo or {})
+    if projection:
+        geo['projection_type'] = projection
+    return go.Figure(traces, _layout(title, height, layout, geo=geo, legend_title=_label(labels, color),
+                                     legend_itemsizing='constant'))
+
+
+def to_json(fig):
+    """JSON spec of ``fig``, encoded with orjson when it is installed.
+
+    orjson encodes the figure's own property dicts as they are, without the
+    deep copy and base64 pass of ``fig.to_dict()``; arrays go out as plain
+    JSON lists, which plotly.js reads the same way.
+    """
+    if orjson is None:
+        return pio.to_json(fig, validate=False)
+    spec = {'data': fig._data, 'layout': fig._layout}
+    return orjson.dumps(spec, option=orjson.OPT_SERIALIZE_NUMPY, default=_jsonable).decode()
+
+
+def from_json(spec):
+    """Figure for a spec written by :func:`to_json`. The spec came from a
+    validated figure, so plotly's per-property validation is skipped."""
+    return go.Figure((orjson.loads if orjson is not None else json.loads)(spec), _validate=False)
+
+
+def _jsonable(value):
+    # What OPT_SERIALIZE_NUMPY leaves out: object arrays such as string
+    # columns, and numpy scalars
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"cannot serialize {type(value).__name__} to JSON")
+
+
+def _label(labels, column):
+    return (labels or {}).get(column, column)
+
+
+def _in_order(values):
+    # Distinct values in order of first appearance, as plotly.express
+    # orders traces and categories
+    unique, first = np.unique(values, return_index=True)
+    return unique[np.argsort(first)]
+
+
+def _stack(frame, columns):
+    if not len(columns):
+        return None
+    return np.column_stack([frame[name].to_numpy() for name in columns])
+
+
+def _colors(n):
+    # Discrete colours come from the active template, like plotly.express
+    template = pio.templates[pio.templates.default] if pio.templates.default else None
+    colorway = (template.layout.colorway if template else None) or qualitative.Plotly
+    return [colorway[i % len(colorway)] for i in range(n)]
+
+
+def _layout(title, height, extra, legend_title=None, **layout):
+    layout.update(height=height, legend_tracegroupgap=0)
+    if title:
+        layout['title_text'] = title
+    else:
+        # Room for the modebar, which a title would otherwise make
+        layout['margin_t'] = 60
+    if legend_title:
+        layout['legend_title_text'] = legend_title
+    return go.Layout(**layout, **extra)
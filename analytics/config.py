@@ -0,0 +1,131 @@
+"""Dataset and query settings, read from a TOML file and ``ECOM_*`` env vars.
+
+Settings are resolved in order: built-in defaults, then the ``[data]`` table
+of the TOML file named by ``ECOM_CONFIG`` (if any), then individual
+environment variables such as ``ECOM_END_DATE=2025-12-31`` or
+``ECOM_MAX_ORDERS_PER_DAY=50000``.
+"""
+
+import hashlib
+import json
+import os
+import tomllib
+from dataclasses import dataclass, field, fields, replace
+
+import pandas as pd
+
+ENV_PREFIX = 'ECOM_'
+ORDER_DISTRIBUTIONS = ('uniform', 'poisson')
+DISTINCT_COUNT_MODES = ('exact', 'approximate')
+QUERY_BACKENDS = ('memory', 'duckdb', 'polars')
+TRUE_STRINGS = ('1', 'true', 'yes', 'on')
+FALSE_STRINGS = ('0', 'false', 'no', 'off')
+
+
+@dataclass(frozen=True)
+class DataConfig:
+    start_date: str = '2023-01-01'
+    end_date: str = '2023-12-31'
+    # Inclusive bounds on the number of orders drawn for each day
+    min_orders_per_day: int = 5
+    max_orders_per_day: int = 19
+    # 'uniform' spreads days evenly between the bounds, 'poisson' centres
+    # them on the midpoint and clips to the bounds
+    order_distribution: str = 'uniform'
+    n_products: int = 6
+    n_regions: int = 4
+    n_customers: int = 8999
+    seed: int = 42
+    # Directory holding the Parquet copy of the generated tables; empty
+    # disables persistence and regenerates on every cold start
+    data_dir: str = field(default='', metadata={'dataset': False})
+    # Also keep a memory-mapped Arrow IPC snapshot in data_dir, which loads
+    # faster than the Parquet copy
+    snapshot: bool = field(default=True, metadata={'dataset': False})
+    # 'exact' counts distinct customers over the filtered orders;
+    # 'approximate' unions per-cell HyperLogLog sketches instead
+    distinct_counts: str = field(default='exact', metadata={'dataset': False})
+    # Target standard error of approximate distinct counts. Only the memory
+    # backend's own sketches honour it; DuckDB and Polars have fixed ones
+    hll_error: float = field(default=0.05, metadata={'dataset': False})
+    # Memory budget of the process-wide filter result cache, in MiB
+    filter_cache_mb: int = field(default=256, metadata={'dataset': False})
+    # Memory budget of the cache of serialized chart figures, in MiB
+    figure_cache_mb: int = field(default=32, metadata={'dataset': False})
+    # Publish the loaded tables to POSIX shared memory so every server
+    # process on the host attaches to one copy
+    shared_memory: bool = field(default=False, metadata={'dataset': False})
+    # Engine that answers the dashboard's queries: 'memory' uses the
+    # in-process cube and indexes, 'duckdb' runs SQL in embedded DuckDB and
+    # 'polars' runs lazy Polars plans
+    query_backend: str = field(default='memory', metadata={'dataset': False})
+    # Most points drawn on the sales trend line before it is downsampled;
+    # about the pixel width of the chart on a wide screen
+    max_trend_points: int = field(default=1000, metadata={'dataset': False})
+
+    def __post_init__(self):
+        if pd.Timestamp(self.end_date) < pd.Timestamp(self.start_date):
+            raise ValueError(f"end_date {self.end_date} is before start_date {self.start_date}")
+        if not 0 <= self.min_orders_per_day <= self.max_orders_per_day:
+            raise ValueError("orders per day bounds must satisfy 0 <= min <= max")
+        if self.order_distribution not in ORDER_DISTRIBUTIONS:
+            raise ValueError(f"order_distribution must be one of {ORDER_DISTRIBUTIONS}")
+        for name in ('n_products', 'n_regions', 'n_customers'):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be at least 1")
+        if self.distinct_counts not in DISTINCT_COUNT_MODES:
+            raise ValueError(f"distinct_counts must be one of {DISTINCT_COUNT_MODES}")
+        if not 0 < self.hll_error < 1:
+            raise ValueError("hll_error must be between 0 and 1")
+        if self.query_backend not in QUERY_BACKENDS:
+            raise ValueError(f"query_backend must be one of {QUERY_BACKENDS}")
+        if self.max_trend_points < 3:
+            raise ValueError("max_trend_points must be at least 3")
+
+    @property
+    def n_days(self):
+        return (pd.Timestamp(self.end_date) - pd.Timestamp(self.start_date)).days + 1
+
+    @property
+    def expected_rows(self):
+        return int(self.n_days * (self.min_orders_per_day + self.max_orders_per_day) / 2)
+
+    def dataset_key(self):
+        """Short stable hash of the settings that shape the generated data."""
+        settings = {f.name: getattr(self, f.name) for f in fields(self) if f.metadata.get('dataset', True)}
+        return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def load_config(path=None, environ=None):
+    """Resolve a DataConfig from defaults, a TOML file and the environment."""
+    environ = os.environ if environ is None else environ
+    path = path or environ.get(f'{ENV_PREFIX}CONFIG')
+
+    overrides = {}
+    if path:
+        with open(path, 'rb') as fh:
+            overrides.update(tomllib.load(fh).get('data', {}))
+    for f in fields(DataConfig):
+        value = environ.get(f'{ENV_PREFIX}{f.name.upper()}')
+        if value is not None:
+            overrides[f.name] = value
+
+    unknown = set(overrides) - {f.name for f in fields(DataConfig)}
+    if unknown:
+        raise ValueError(f"Unknown data settings: {', '.join(sorted(unknown))}")
+
+    return replace(DataConfig(), **{name: _coerce(name, value) for name, value in overrides.items()})
+
+
+def _coerce(name, value):
+    # Env vars arrive as strings and TOML dates as datetime.date, so cast
+    # each value to the type of the field's default
+    default = getattr(DataConfig, name)
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        spelling = str(value).strip().lower()
+        if spelling not in TRUE_STRINGS + FALSE_STRINGS:
+            raise ValueError(f"{name} must be one of {TRUE_STRINGS + FALSE_STRINGS}, not {value!r}")
+        return spelling in TRUE_STRINGS
+    return type(default)(value) if isinstance(default, (int, float)) else str(value)
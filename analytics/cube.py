@@ -0,0 +1,238 @@
+"""Pre-aggregated daily cube behind the dashboard's KPIs and charts.
+
+Every order is rolled up at load time into a cell keyed by
+``Day x Product x Region x LoyaltyTier x Gender`` holding the summed
+Revenue, Quantity and Discount and the order count. Queries then touch one
+entry per non-empty cell instead of one per order.
+
+Category is not a cube dimension: it is derived from Product through the
+catalog, so a Category filter becomes a Product filter.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.aggregation import GroupBy, aggregate
+from analytics.hll import SketchBank
+from analytics.time_buckets import bucket_sums, epoch_days
+
+DIMENSIONS = ['Day', 'Product', 'Region', 'LoyaltyTier', 'Gender']
+MEASURES = ['Revenue', 'Quantity', 'Discount', 'Orders']
+
+
+class DailyCube:
+    def __init__(self, star, date_index):
+        sales = star.sales
+        self.date_index = date_index
+        self.labels = {
+            'Product': list(sales['Product'].cat.categories),
+            'Region': list(sales['Region'].cat.categories),
+            'LoyaltyTier': list(star.customers['LoyaltyTier'].cat.categories),
+            'Gender': list(star.customers['Gender'].cat.categories),
+            'Category': list(sales['Category'].cat.categories),
+        }
+
+        self.product_category = np.zeros(len(self.labels['Product']), dtype=np.int64)
+        self.product_category[sales['Product'].cat.codes.to_numpy()] = sales['Category'].cat.codes.to_numpy()
+        # Tier and gender get one extra trailing code for orders without a
+        # customer row, so they count towards totals but no tier/gender group
+        self.sizes = [date_index.n_days] + [len(self.labels[name]) + (name in ('LoyaltyTier', 'Gender'))
+                                            for name in DIMENSIONS[1:]]
+
+        key = self._row_keys(star)
+        # Small key spaces are counted densely; otherwise fall back to a sort
+        dense_size = int(np.prod(self.sizes, dtype=np.int64))
+        dense = dense_size <= 4 * len(sales) + 1024
+        if dense:
+            cell_keys = np.flatnonzero(np.bincount(key, minlength=dense_size))
+            cell_of_row, n_slots = key, dense_size
+        else:
+            cell_keys, cell_of_row = np.unique(key, return_inverse=True)
+            n_slots = len(cell_keys)
+
+        def cell_sum(values=None):
+            totals = np.bincount(cell_of_row, weights=values, minlength=n_slots)
+            return totals[cell_keys] if dense else totals
+
+        self.measures = {
+            'Revenue': cell_sum(sales['Revenue'].to_numpy()),
+            'Quantity': cell_sum(sales['Quantity'].to_numpy()).astype(np.int64),
+            'Discount': cell_sum(sales['Discount'].to_numpy()),
+            'Orders': cell_sum().astype(np.int64),
+        }
+
+        self.cell_keys = cell_keys
+        self.codes = {}
+        remainder = cell_keys
+        for name, size in reversed(list(zip(DIMENSIONS, self.sizes))):
+            remainder, self.codes[name] = np.divmod(remainder, size)
+        # Category rides along as a derived key so it can be grouped like
+        # any other dimension
+        self.codes['Category'] = self.product_category[self.codes['Product']]
+        self.cardinality = dict(zip(DIMENSIONS, self.sizes), Category=len(self.labels['Category']))
+        self.columns = {**self.codes, **self.measures}
+        # Cells are in key order and Day is the most significant digit, so
+        # each day's cells are contiguous just like the fact table's rows
+        self.day_offsets = np.searchsorted(self.codes['Day'], np.arange(date_index.n_days + 1))
+
+    @property
+    def n_cells(self):
+        return len(self.codes['Day'])
+
+    def _row_keys(self, star):
+        codes = {
+            'Day': np.repeat(np.arange(self.date_index.n_days), np.diff(self.date_index.day_offsets)),
+            'Product': star.sales['Product'].cat.codes.to_numpy(),
+            'Region': star.sales['Region'].cat.codes.to_numpy(),
+            'LoyaltyTier': _customer_codes(star, 'LoyaltyTier'),
+            'Gender': _customer_codes(star, 'Gender'),
+        }
+        key = np.zeros(len(star.sales), dtype=np.int64)
+        for name, size in zip(DIMENSIONS, self.sizes):
+            key = key * size + codes[name]
+        return key
+
+    def customer_sketches(self, star, precision):
+        """HyperLogLog sketches of CustomerID per Day x Product x Region x
+        LoyaltyTier cell.
+
+        Gender is the last key digit, so dropping it merges neighbouring
+        cube cells and halves the sketch memory; distinct counts can then be
+        split by any dimension except Gender.
+        """
+        sketch_keys = self.cell_keys // self.sizes[-1]
+        unique_keys, cell_sketch = np.unique(sketch_keys, return_inverse=True)
+        row_sketch = np.searchsorted(unique_keys, self._row_keys(star) // self.sizes[-1])
+        bank = SketchBank.build(row_sketch, len(unique_keys), star.sales['CustomerID'].to_numpy(), precision)
+        return CellSketches(bank, cell_sketch)
+
+    def day_range(self, start=None, end=None):
+        """Half-open day numbers for ``start <= Date <= end``; the whole
+        history when no range is given."""
+        return (0, self.date_index.n_days) if start is None else self.date_index.day_range(start, end)
+
+    def allowed_codes(self, selections):
+        """``{dimension: bool mask over its codes}`` for each dimension the
+        ``{column: values}`` selections actually restrict, with Category
+        folded into Product."""
+        allowed = {}
+        for name, selected in (selections or {}).items():
+            mask = np.isin(self.labels[name], list(selected))
+            if mask.all():
+                continue
+            if name == 'Category':
+                name, mask = 'Product', mask[self.product_category]
+            allowed[name] = allowed[name] & mask if name in allowed else mask
+        return allowed
+
+    def query(self, start=None, end=None, selections=None):
+        """Cells for ``start <= Date <= end`` matching ``{column: values}``
+        for any of Category, Product, Region, LoyaltyTier or Gender."""
+        lo, hi = self.day_range(start, end)
+        cells = slice(int(self.day_offsets[lo]), int(self.day_offsets[hi]))
+
+        mask = None
+        for name, allowed in self.allowed_codes(selections).items():
+            column_mask = _padded(allowed, name)[self.codes[name][cells]]
+            mask = column_mask if mask is None else mask & column_mask
+
+        positions = np.arange(cells.start, cells.stop) if mask is None else np.flatnonzero(mask) + cells.start
+        return CubeView(self, positions)
+
+
+@dataclass(frozen=True)
+class CellSketches:
+    bank: SketchBank
+    # Index into ``bank`` of each cube cell's sketch
+    cell_sketch: np.ndarray
+
+
+class CubeView:
+    """A set of selected cube cells."""
+
+    def __init__(self, cube, positions):
+        self.cube = cube
+        self.positions = positions
+
+    @property
+    def nbytes(self):
+        return self.positions.nbytes
+
+    def aggregate(self, specs):
+        """Evaluate :class:`~analytics.aggregation.GroupBy` specs over the
+        selected cells in one pass."""
+        return aggregate(self.cube.columns, self.cube.cardinality, specs, self.positions)
+
+    def total(self, measure):
+        return self.cube.measures[measure][self.positions].sum()
+
+    def _codes(self, dimension):
+        return self.cube.codes[dimension][self.positions]
+
+    def by(self, dimension):
+        """Per-value totals of every measure, with Discount as the mean
+        discount per order; values with no orders are left out, as in a
+        ``groupby`` on an observed categorical."""
+        sums, = self.aggregate([measures_by(dimension)])
+        return measure_frame(dimension, self.cube.labels[dimension], sums)
+
+    def _sketch_positions(self, sketches):
+        # Cells sharing a sketch are adjacent, so dropping repeats dedupes
+        ids = sketches.cell_sketch[self.positions]
+        first = np.r_[True, ids[1:] != ids[:-1]] if len(ids) else np.zeros(0, dtype=bool)
+        return ids[first], first
+
+    def distinct_customers(self, sketches):
+        """Approximate number of distinct customers in the selected cells."""
+        ids, _ = self._sketch_positions(sketches)
+        return sketches.bank.count(ids)
+
+    def distinct_customers_by(self, sketches, dimension):
+        """Approximate distinct customers per value of ``dimension``."""
+        if dimension == 'Gender':
+            raise ValueError("customer sketches are not split by Gender")
+        ids, first = self._sketch_positions(sketches)
+        labels = self.cube.labels[dimension]
+        counts = sketches.bank.count_by(ids, self._codes(dimension)[first], len(labels) + 1)
+        return pd.Series(counts[:len(labels)], index=pd.CategoricalIndex(labels, categories=labels, name=dimension))
+
+    def by_period(self, freq='day'):
+        """Revenue per ``freq`` period (see :mod:`analytics.time_buckets`)
+        that has at least one selected order, as ``Label``/``Date``/``Revenue``."""
+        days = self.cube.codes['Day'][self.positions] + epoch_days(self.cube.date_index.origin)
+        trend = bucket_sums(days, self.cube.measures['Revenue'][self.positions], freq)
+        return trend.rename(columns={'Value': 'Revenue'})
+
+
+def measures_by(dimension):
+    """GroupBy summing every cube measure per value of ``dimension``."""
+    return GroupBy((dimension,), tuple((name, 'sum', name) for name in MEASURES))
+
+
+def measure_frame(dimension, labels, sums):
+    """Shape the :func:`measures_by` sums like :meth:`CubeView.by`. Tier and
+    gender sums carry a trailing "no customer row" slot, which is dropped."""
+    sums = {name: values[:len(labels)] for name, values in sums.items()}
+    result = pd.DataFrame({
+        dimension: pd.Categorical(labels, categories=labels),
+        'Revenue': sums['Revenue'],
+        'Quantity': sums['Quantity'].astype(np.int64),
+        'Discount': sums['Discount'] / np.maximum(sums['Orders'], 1),
+        'Orders': sums['Orders'].astype(np.int64),
+    })
+    return result[result['Orders'] > 0].reset_index(drop=True)
+
+
+def _customer_codes(star, name):
+    codes = star.customers[name].cat.codes.to_numpy()
+    missing = len(star.customers[name].cat.categories)
+    positions = star.sales['CustomerPos'].to_numpy()
+    return np.where(positions >= 0, codes[positions], missing)
+
+
+def _padded(allowed, name):
+    # Tier and gender codes carry one extra "no customer row" slot, which
+    # never matches an explicit selection
+    return np.append(allowed, False) if name in ('LoyaltyTier', 'Gender') else allowed
@@ -0,0 +1,137 @@
+"""Synthetic sales and customer data for the dashboard."""
+
+import numpy as np
+import pandas as pd
+
+PRODUCTS = ['Laptop', 'Phone', 'Tablet', 'Headphones', 'Smartwatch', 'Camera']
+CATEGORIES = ['Electronics', 'Electronics', 'Electronics', 'Accessories', 'Accessories', 'Electronics']
+REGIONS = ['North', 'South', 'East', 'West']
+REGION_COORDS = {
+    'North': {'lat': 40, 'lon': -100},
+    'South': {'lat': 30, 'lon': -100},
+    'East': {'lat': 35, 'lon': -75},
+    'West': {'lat': 35, 'lon': -120}
+}
+FIRST_CUSTOMER_ID = 1000
+DISCOUNTS = np.array([0, 0.05, 0.1, 0.15, 0.2])
+DISCOUNT_WEIGHTS = [0.5, 0.2, 0.15, 0.1, 0.05]
+GENDERS = ['Male', 'Female']
+LOYALTY_TIERS = ['Bronze', 'Silver', 'Gold']
+LOYALTY_WEIGHTS = [0.6, 0.3, 0.1]
+
+
+def make_catalog(n_products):
+    """Return ``(products, categories)`` for a catalog of ``n_products``.
+
+    The first six entries are the original demo catalog; larger catalogs
+    are padded with numbered products spread across the same categories.
+    """
+    category_names = sorted(set(CATEGORIES))
+    products = PRODUCTS[:n_products] + [f'Product {i + 1}' for i in range(len(PRODUCTS), n_products)]
+    categories = CATEGORIES[:n_products] + [category_names[i % len(category_names)]
+                                            for i in range(len(PRODUCTS), n_products)]
+    return products, categories
+
+
+def make_regions(n_regions):
+    return REGIONS[:n_regions] + [f'Region {i + 1}' for i in range(len(REGIONS), n_regions)]
+
+
+def region_coordinates(regions):
+    """Map each region name to a ``{'lat', 'lon'}`` marker position.
+
+    The four compass regions keep their fixed positions; any extra regions
+    are laid out on a ring around the centre of the US.
+    """
+    coords = {}
+    for i, region in enumerate(regions):
+        if region in REGION_COORDS:
+            coords[region] = REGION_COORDS[region]
+        else:
+            angle = 2 * np.pi * i / len(regions)
+            coords[region] = {'lat': 37 + 8 * np.sin(angle), 'lon': -97 + 20 * np.cos(angle)}
+    return coords
+
+
+def daily_order_counts(rng, config):
+    lo, hi = config.min_orders_per_day, config.max_orders_per_day
+    if config.order_distribution == 'poisson':
+        return np.clip(rng.poisson((lo + hi) / 2, size=config.n_days), lo, hi)
+    return rng.integers(lo, hi + 1, size=config.n_days)
+
+
+def generate_sales(rng, config):
+    """Build every order row for the configured date range in a handful of
+    batched draws."""
+    dates = pd.date_range(start=config.start_date, end=config.end_date)
+    products, categories = make_catalog(config.n_products)
+    regions = make_regions(config.n_regions)
+    orders_per_day = daily_order_counts(rng, config)
+    n_rows = int(orders_per_day.sum())
+
+    product_idx = rng.integers(0, len(products), size=n_rows, dtype=_code_dtype(len(products)))
+    price = rng.uniform(100, 2000, size=n_rows)
+    quantity = rng.integers(1, 3, size=n_rows, dtype=np.int8)
+    region_idx = rng.integers(0, len(regions), size=n_rows, dtype=_code_dtype(len(regions)))
+    discount = DISCOUNTS[_weighted_codes(rng, DISCOUNT_WEIGHTS, n_rows)]
+    customer_id = rng.integers(FIRST_CUSTOMER_ID, FIRST_CUSTOMER_ID + config.n_customers, size=n_rows)
+
+    # Categoricals are built straight from the integer draws, so no
+    # per-row Python strings are ever materialised, and copy=False keeps
+    # pandas from consolidating the columns into 2-D blocks.
+    category_names = sorted(set(categories))
+    product_category = np.array([category_names.index(c) for c in categories], dtype=product_idx.dtype)
+
+    return pd.DataFrame({
+        'Date': np.repeat(dates.values, orders_per_day),
+        'Product': pd.Categorical.from_codes(product_idx, products, validate=False),
+        'Category': pd.Categorical.from_codes(product_category[product_idx], category_names, validate=False),
+        'Price': price,
+        'Quantity': quantity.astype(np.int64),
+        'Revenue': price * quantity * (1 - discount),
+        'Discount': discount,
+        'Region': pd.Categorical.from_codes(region_idx, regions, validate=False),
+        'CustomerID': customer_id,
+    }, copy=False)
+
+
+def generate_customers(rng, customer_ids, config):
+    """Build one profile row per customer ID, sorted by ID, in a single
+    batched pass.
+
+    Customers join at some point during the year before the sales history
+    starts. Join dates are drawn as int16 day offsets, ages as uint8 and
+    Gender/LoyaltyTier as categorical codes.
+    """
+    customer_ids = np.sort(np.asarray(customer_ids))
+    n_customers = len(customer_ids)
+    joined_by = pd.Timestamp(config.start_date)
+    join_start = joined_by - pd.DateOffset(years=1)
+    join_offset = rng.integers(0, (joined_by - join_start).days + 1, size=n_customers, dtype=np.int16)
+
+    return pd.DataFrame({
+        'CustomerID': customer_ids,
+        'Age': rng.integers(18, 70, size=n_customers, dtype=np.uint8),
+        'Gender': pd.Categorical.from_codes(
+            rng.integers(0, len(GENDERS), size=n_customers, dtype=np.int8), GENDERS, validate=False),
+        'JoinDate': (np.datetime64(join_start.date(), 'D') + join_offset.astype('timedelta64[D]')).astype('datetime64[us]'),
+        'LoyaltyTier': pd.Categorical.from_codes(
+            _weighted_codes(rng, LOYALTY_WEIGHTS, n_customers), LOYALTY_TIERS, validate=False),
+    }, copy=False)
+
+
+def _weighted_codes(rng, weights, size):
+    # Every weight used here is a multiple of 5%, so a uniform draw over 20
+    # slots mapped through a lookup table samples them exactly and avoids
+    # the CDF search ``rng.choice(p=...)`` does per element.
+    slots = np.repeat(np.arange(len(weights), dtype=np.int8), np.rint(np.asarray(weights) * 20).astype(int))
+    assert len(slots) == 20, "weights must be multiples of 0.05"
+    return slots[rng.integers(0, len(slots), size=size, dtype=np.int8)]
+
+
+def _code_dtype(n_values):
+    # Smallest signed type pandas accepts as Categorical codes
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
@@ -0,0 +1,42 @@
+"""Finished Plotly figures, reused while the data they plot is unchanged.
+
+Building and serializing a figure can cost more than aggregating the
+handful of rows most dashboard charts show. Each chart is keyed on a digest
+of its input frame plus the builder and its arguments, so a rerun, a
+fragment rerun or another session drawing the same aggregate gets the
+figure's JSON spec from the cache instead of rebuilding it.
+"""
+
+import hashlib
+import json
+
+import pandas as pd
+
+from analytics import charts
+
+
+def frame_digest(frame):
+    """Digest of a frame's values, index, column names and dtypes."""
+    digest = hashlib.blake2b(digest_size=16)
+    # repr of a CategoricalDtype lists its categories, which set the order
+    # plotly draws the groups in
+    digest.update(repr(list(frame.dtypes.items())).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cached_figure(cache, build, frame, **params):
+    """The figure ``build(frame, **params)`` returns, from ``cache`` (an
+    :class:`~analytics.filter_cache.LRUCache`) when the same builder already
+    plotted equal data with equal ``params``.
+
+    The cache holds the serialized spec rather than the figure object, so
+    sessions never share a mutable figure and its size is easy to account.
+    """
+    key = (
+        f'{build.__module__}.{build.__qualname__}',
+        frame_digest(frame),
+        json.dumps(params, sort_keys=True, default=repr)
+    )
+    spec = cache.get_or_compute(key, lambda: charts.to_json(build(frame, **params)))
+    return charts.from_json(spec)
@@ -0,0 +1,106 @@
+"""Process-wide LRU cache for filter results, bounded by size in bytes.
+
+Entries are keyed on the normalised sidebar filter (see
+:class:`analytics.backends.base.Filter`) plus the name of whatever was
+derived from it, so two sessions that pick the same view, or one session
+toggling back to an earlier one, share the row positions and aggregates
+computed the first time.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def nbytes(value):
+    """Approximate memory held by a cached value."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if hasattr(value, 'nbytes'):
+        # numpy arrays and index structures such as CubeView
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(nbytes(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Cached value for ``key``, calling ``compute()`` on a miss.
+
+        ``compute`` runs outside the lock, so two sessions missing the same
+        key at once may both compute it; the later result wins.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        self._store(key, value)
+        return value
+
+    def get_or_compute_many(self, keys, compute):
+        """Cached values for ``keys`` as a list, calling ``compute(missing)``
+        once with every key that missed; it returns ``{key: value}``."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key][0]
+            self.hits += len(found)
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            self.misses += len(missing)
+
+        if missing:
+            computed = compute(missing)
+            for key in missing:
+                self._store(key, computed[key])
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def _store(self, key, value):
+        size = nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
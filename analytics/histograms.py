@@ -0,0 +1,30 @@
+"""Histograms binned on the server, so charts ship bin counts, not values."""
+
+import numpy as np
+import pandas as pd
+
+
+def integer_bins(counts, n_bins=20):
+    """Group per-value ``counts`` of an integer attribute into at most
+    ``n_bins`` equal-width bins.
+
+    ``counts`` is a Series of counts indexed by value, such as
+    :meth:`~analytics.presence.CustomerPresence.distribution` gives for Age.
+    Bins are a whole number of values wide, so an age never straddles two
+    bars. Returns ``Start``/``End`` (inclusive) bounds, a ``Label`` and the
+    summed ``count`` of every bin from the smallest to the largest value.
+    """
+    values = counts.index.to_numpy(dtype=np.int64)
+    if len(values) == 0:
+        return pd.DataFrame({'Start': [], 'End': [], 'Label': [], 'count': []})
+    lo, hi = int(values.min()), int(values.max())
+    width = -(-(hi - lo + 1) // n_bins)
+    totals = np.bincount((values - lo) // width, weights=counts.to_numpy(), minlength=(hi - lo) // width + 1)
+    starts = lo + width * np.arange(len(totals))
+    ends = starts + width - 1
+    return pd.DataFrame({
+        'Start': starts,
+        'End': ends,
+        'Label': [f'{start}' if width == 1 else f'{start}–{end}' for start, end in zip(starts, ends)],
+        'count': totals.astype(np.int64),
+    })
@@ -0,0 +1,105 @@
+"""HyperLogLog sketches for approximate distinct counts.
+
+A :class:`SketchBank` holds one sketch per group (for the dashboard, one per
+cube cell). Sketches are unioned by taking the element-wise max of their
+registers, so the distinct count of any set of groups costs one reduction
+over ``len(groups) x 2**precision`` bytes regardless of how many rows fed
+them.
+"""
+
+import math
+
+import numpy as np
+
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+# Sketches unioned per step; keeps the gathered block cache-sized
+_UNION_CHUNK = 2048
+
+
+def precision_for_error(error):
+    """Smallest precision whose standard error ``1.04 / sqrt(2**p)`` is at
+    most ``error``."""
+    precision = math.ceil(math.log2((1.04 / error) ** 2))
+    return min(max(precision, MIN_PRECISION), MAX_PRECISION)
+
+
+def standard_error(precision):
+    return 1.04 / math.sqrt(1 << precision)
+
+
+def hash64(values):
+    """SplitMix64 finaliser, applied element-wise to integer ``values``."""
+    x = np.asarray(values).astype(np.uint64)
+    with np.errstate(over='ignore'):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def estimate(registers):
+    """Cardinality estimate for each sketch along the last axis."""
+    registers = np.asarray(registers)
+    m = registers.shape[-1]
+    alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)), axis=-1)
+    # Linear counting is more accurate while many registers are still empty
+    zeros = np.count_nonzero(registers == 0, axis=-1)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+class SketchBank:
+    def __init__(self, registers):
+        self.registers = registers
+
+    @classmethod
+    def build(cls, groups, n_groups, items, precision):
+        """Sketch the distinct ``items`` within each of ``n_groups`` groups,
+        where ``groups[i]`` is the group of ``items[i]``."""
+        hashes = hash64(items)
+        width = 64 - precision
+        bucket = (hashes >> np.uint64(width)).astype(np.int64)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # Rank is the position of the leftmost 1-bit in the remaining bits;
+        # frexp's exponent is the bit length of a positive integer
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = (width - bit_length + 1).astype(np.uint8)
+
+        registers = np.zeros((n_groups, 1 << precision), dtype=np.uint8)
+        slots = np.asarray(groups, dtype=np.int64) * (1 << precision) + bucket
+        # Fancy assignment with repeated slots keeps an unspecified write,
+        # so take the max explicitly
+        np.maximum.at(registers.reshape(-1), slots, rank)
+        return cls(registers)
+
+    @property
+    def precision(self):
+        return int(self.registers.shape[1]).bit_length() - 1
+
+    @property
+    def nbytes(self):
+        return self.registers.nbytes
+
+    def union(self, positions):
+        """Registers of the union of the sketches at ``positions``."""
+        merged = np.zeros(self.registers.shape[1], dtype=np.uint8)
+        for start in range(0, len(positions), _UNION_CHUNK):
+            block = self.registers[positions[start:start + _UNION_CHUNK]]
+            np.maximum(merged, block.max(axis=0), out=merged)
+        return merged
+
+    def count(self, positions):
+        """Approximate distinct items across the sketches at ``positions``."""
+        if len(positions) == 0:
+            return 0
+        return int(np.rint(estimate(self.union(positions))))
+
+    def count_by(self, positions, keys, n_keys):
+        """Approximate distinct items per key, where ``keys[i]`` (in
+        ``range(n_keys)``) labels the sketch at ``positions[i]``."""
+        counts = np.zeros(n_keys, dtype=np.int64)
+        for key in np.unique(keys):
+            counts[key] = np.rint(estimate(self.union(positions[keys == key])))
+        return counts
@@ -0,0 +1,88 @@
+"""Secondary indexes over the Date-sorted sales fact table."""
+
+import numpy as np
+import pandas as pd
+
+
+class DateIndex:
+    """Row offsets of each calendar day in a Date-sorted column.
+
+    ``day_offsets[d]`` is the first row on or after day ``d`` (counted from
+    the first date in the table), so the rows for an inclusive date range
+    are a single contiguous slice and selecting them never scans or copies
+    the column.
+    """
+
+    def __init__(self, dates):
+        days = pd.DatetimeIndex(dates).values.astype('datetime64[D]')
+        if len(days) and (np.diff(days.view(np.int64)) < 0).any():
+            raise ValueError("DateIndex needs the table sorted by Date")
+
+        self.origin = days[0] if len(days) else np.datetime64('1970-01-01', 'D')
+        day_numbers = (days - self.origin).astype(np.int64)
+        self.n_days = int(day_numbers[-1]) + 1 if len(days) else 0
+        self.day_offsets = np.searchsorted(day_numbers, np.arange(self.n_days + 1), side='left')
+
+    def day_number(self, date):
+        """Days between the first date in the table and ``date``."""
+        return int((np.datetime64(pd.Timestamp(date).date(), 'D') - self.origin).astype(np.int64))
+
+    def day_range(self, start, end):
+        """Half-open ``[lo, hi)`` day numbers for ``start <= Date <= end``,
+        clipped to the days in the table."""
+        lo = min(max(self.day_number(start), 0), self.n_days)
+        hi = min(max(self.day_number(end) + 1, lo), self.n_days)
+        return lo, hi
+
+    def slice(self, start, end):
+        """Row slice covering ``start <= Date <= end`` (both inclusive)."""
+        lo, hi = self.day_range(start, end)
+        return slice(int(self.day_offsets[lo]), int(self.day_offsets[hi]))
+
+
+class BitmapIndex:
+    """One packed bitmap per distinct value of each low-cardinality column.
+
+    A multiselect filter is answered by OR-ing the bitmaps of the selected
+    values within a column and AND-ing the results across columns, touching
+    one bit per row per selected value instead of comparing strings.
+    """
+
+    def __init__(self, frame, columns):
+        self.n_rows = len(frame)
+        self.values = {}
+        self.bitmaps = {}
+        for name in columns:
+            column = frame[name].astype('category')
+            codes = column.cat.codes.to_numpy()
+            self.values[name] = list(column.cat.categories)
+            # Row r of the table is bit r of each bitmap, so a row slice maps
+            # onto a byte slice of every bitmap
+            self.bitmaps[name] = np.stack([np.packbits(codes == code) for code in range(len(self.values[name]))]) \
+                if self.values[name] else np.zeros((0, (self.n_rows + 7) // 8), dtype=np.uint8)
+
+    def select(self, selections, rows=None):
+        """Rows within ``rows`` matching every ``{column: selected values}``.
+
+        Returns ``rows`` itself (a slice) when no column is actually
+        restricted, so the caller can keep a zero-copy view, and an array
+        of row positions otherwise.
+        """
+        rows = slice(0, self.n_rows) if rows is None else rows
+        start, stop = rows.start, rows.stop
+        first_byte, last_byte = start // 8, (stop + 7) // 8
+
+        mask = None
+        for name, selected in selections.items():
+            codes = [self.values[name].index(value) for value in selected if value in self.values[name]]
+            if len(codes) == len(self.values[name]):
+                continue
+            if not codes:
+                return np.empty(0, dtype=np.int64)
+            column_mask = np.bitwise_or.reduce(self.bitmaps[name][codes, first_byte:last_byte], axis=0)
+            mask = column_mask if mask is None else mask & column_mask
+
+        if mask is None:
+            return rows
+        bits = np.unpackbits(mask)[start - first_byte * 8:stop - first_byte * 8]
+        return np.flatnonzero(bits) + start
@@ -0,0 +1,52 @@
+"""Which customers are active in a set of orders, as a presence mask.
+
+Distinct customers were found by hashing or sorting the matching orders
+(``drop_duplicates`` / ``np.unique``). Here each order sets one flag at its
+customer's row position instead, so the active set costs one scatter over
+the orders and comes out as a boolean mask over the customer table. Age,
+gender and tier distributions are then counted straight from the compact
+customer columns, in time proportional to customers rather than orders.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class CustomerPresence:
+    def __init__(self, star):
+        self.customers = star.customers
+        self.customer_pos = star.sales['CustomerPos'].to_numpy()
+
+    @property
+    def n_customers(self):
+        return len(self.customers)
+
+    def active(self, rows):
+        """Boolean mask over the customer table of customers with at least
+        one order in ``rows`` (a slice or row positions of the fact table)."""
+        positions = self.customer_pos[rows]
+        mask = np.zeros(self.n_customers, dtype=bool)
+        mask[positions[positions >= 0]] = True
+        return mask
+
+    def positions(self, rows):
+        """Sorted row positions of the active customers."""
+        return np.flatnonzero(self.active(rows))
+
+    def distribution(self, mask, attribute):
+        """Active customers per value of ``attribute``, as a Series named
+        ``count``: every category for categorical attributes, and the
+        values that occur, in ascending order, for numeric ones."""
+        column = self.customers[attribute]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            labels = column.cat.categories
+            codes = column.cat.codes.to_numpy()[mask]
+            counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+            index = pd.CategoricalIndex(labels, categories=labels, name=attribute)
+            return pd.Series(counts, index=index, name='count')
+        values = column.to_numpy()[mask]
+        if np.issubdtype(values.dtype, np.integer) and len(values) and values.min() >= 0:
+            counts = np.bincount(values)
+            present = np.flatnonzero(counts)
+            return pd.Series(counts[present], index=pd.Index(present, name=attribute), name='count')
+        return pd.Series(values).value_counts(sort=False).sort_index().rename_axis(attribute).rename('count')
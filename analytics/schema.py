@@ -0,0 +1,76 @@
+"""Compact column types for the sales and customer tables.
+
+Low-cardinality strings become Categoricals, money and rates become
+float32, small counts become uint8 and IDs take the narrowest unsigned type
+that holds their largest value. float32 keeps roughly seven significant
+digits, which is plenty for a single order's price or revenue; totals over
+many rows should be accumulated in float64 (``np.sum(..., dtype=np.float64)``).
+"""
+
+import numpy as np
+import pandas as pd
+
+SALES_DTYPES = {
+    'Product': 'category',
+    'Category': 'category',
+    'Region': 'category',
+    'Price': np.float32,
+    'Quantity': np.uint8,
+    'Revenue': np.float32,
+    'Discount': np.float32,
+}
+CUSTOMER_DTYPES = {
+    'Age': np.uint8,
+    'Gender': 'category',
+    'LoyaltyTier': 'category',
+}
+ID_COLUMNS = ['CustomerID']
+
+
+def id_dtype(max_value):
+    """Narrowest unsigned integer type that can hold ``max_value``."""
+    for dtype in (np.uint16, np.uint32):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def compact(df, dtypes):
+    """Return ``df`` with ``dtypes`` and narrowed ID columns applied.
+
+    Columns that already have the target type are left untouched, so this
+    is cheap to call on data that was compacted before it was stored.
+    """
+    casts = {name: dtype for name, dtype in dtypes.items() if name in df.columns}
+    for name in ID_COLUMNS:
+        if name in df.columns and len(df):
+            casts[name] = id_dtype(int(df[name].max()))
+
+    changed = {name: dtype for name, dtype in casts.items() if df[name].dtype != dtype}
+    return df.astype(changed) if changed else df
+
+
+def compact_sales(df):
+    return compact(df, SALES_DTYPES)
+
+
+def compact_customers(df):
+    return compact(df, CUSTOMER_DTYPES)
+
+
+def memory_report(df):
+    """Bytes held by each column, largest first, with a total row."""
+    usage = df.memory_usage(index=False, deep=True)
+    return usage_report(usage.index, [str(df[name].dtype) for name in usage.index], usage.to_numpy())
+
+
+def usage_report(names, dtypes, nbytes):
+    """:func:`memory_report` layout for byte counts gathered elsewhere,
+    such as a query engine's own storage."""
+    report = pd.DataFrame({
+        'Column': list(names),
+        'Dtype': list(dtypes),
+        'Bytes': np.asarray(nbytes, dtype=np.int64),
+    }).sort_values('Bytes', ascending=False, ignore_index=True)
+    total = pd.DataFrame({'Column': ['Total'], 'Dtype': [''], 'Bytes': [int(report['Bytes'].sum())]})
+    return pd.concat([report, total], ignore_index=True)
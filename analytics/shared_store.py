@@ -0,0 +1,223 @@
+"""Publish the sales and customer tables once into POSIX shared memory.
+
+Every Streamlit process behind a load balancer otherwise holds its own copy
+of the tables. With shared memory the first process to load them copies
+each column into one block, and every other process attaches to that block
+and wraps it in read-only numpy views. N workers then cost about one copy of
+the data, and a new worker starts without reading or generating anything.
+
+Each table has two segments named after the dataset key:
+
+* ``ecom-<key>-<table>`` holds the column buffers back to back, 64-byte aligned
+* ``ecom-<key>-<table>-manifest`` holds an 8-byte length followed by a JSON
+  description of each column (dtype, offset, and categories for Categoricals)
+
+The manifest is created only after the data is in place and its length is
+written last, so a reader never sees a half-filled table. Publishers hold an
+``flock`` on a lock file in the temp directory while they write; the kernel
+drops it when the holder exits, so segments left behind by a publisher that
+died half way are found and replaced by the next one. Segments outlive the
+process that created them; call :func:`unlink` (or reboot) to free them.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+_ALIGNMENT = 64
+_HEADER = 8
+# How long a process waits for another one publishing the same table
+_PUBLISH_TIMEOUT = 10.0
+TABLES = ('sales', 'customers')
+
+# Open segments, kept referenced so their buffers stay mapped
+_MAPPINGS = []
+
+log = logging.getLogger(__name__)
+
+
+def segment_name(config, table):
+    return f'ecom-{config.dataset_key()}-{table}'
+
+
+def publish(config, sales_df, customer_df):
+    """Copy both tables into shared memory and return views onto the
+    shared copies. If another process published first, its copy is
+    returned instead."""
+    published = []
+    for table, frame in zip(TABLES, (sales_df, customer_df)):
+        published.append(_publish_table(segment_name(config, table), frame))
+    return tuple(published)
+
+
+def attach(config):
+    """``(sales_df, customer_df)`` backed by the published segments, or
+    ``None`` if the tables have not been published yet."""
+    tables = []
+    for table in TABLES:
+        frame = _attach_table(segment_name(config, table))
+        if frame is None:
+            return None
+        tables.append(frame)
+    return tuple(tables)
+
+
+def unlink(config):
+    """Remove the published segments; processes already attached keep
+    their mappings until they exit."""
+    for table in TABLES:
+        _unlink_table(segment_name(config, table))
+
+
+def _publish_table(name, frame):
+    columns, buffers, size = [], [], 0
+    for column in frame.columns:
+        values = frame[column]
+        spec = {'name': column}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            spec['categories'] = values.cat.categories.tolist()
+            spec['ordered'] = bool(values.cat.ordered)
+            values = values.cat.codes
+        array = np.ascontiguousarray(values.to_numpy())
+        if array.dtype == object:
+            raise TypeError(f"column {column!r} has object dtype and cannot be shared")
+        spec.update(dtype=array.dtype.str, offset=size, length=len(array))
+        columns.append(spec)
+        buffers.append(array)
+        size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+    with _publish_lock(name) as locked:
+        if not locked:
+            log.warning("shared table %s is still being published by another process after %.0f s; "
+                        "keeping a private copy", name, _PUBLISH_TIMEOUT)
+            return frame
+        # Another process may have finished publishing while we waited
+        shared = _attach_table(name, timeout=0)
+        if shared is not None:
+            return shared
+        # With the lock held no publisher is running, so any segment under
+        # this name was left by one that died before finishing
+        _unlink_table(name)
+        data = _create(name, max(size, 1))
+        for spec, array in zip(columns, buffers):
+            np.ndarray(array.shape, array.dtype, data.buf, spec['offset'])[:] = array
+
+        manifest = json.dumps({'rows': len(frame), 'columns': columns}).encode()
+        meta = _create(f'{name}-manifest', _HEADER + len(manifest))
+        meta.buf[_HEADER:_HEADER + len(manifest)] = manifest
+        meta.buf[:_HEADER] = len(manifest).to_bytes(_HEADER, 'little')
+        meta.close()
+    return _frame(data, columns)
+
+
+def _attach_table(name, timeout=_PUBLISH_TIMEOUT):
+    # None unless a finished manifest turns up within ``timeout``; the
+    # manifest appears once the data is in place, its length last of all
+    try:
+        meta = _open(f'{name}-manifest')
+    except FileNotFoundError:
+        return None
+
+    deadline = time.monotonic() + timeout
+    try:
+        length = int.from_bytes(meta.buf[:_HEADER], 'little')
+        while length == 0:
+            # The length is written before the publisher lets go of the
+            # lock, so an unlocked table that still has none is an orphan
+            publishing = _is_locked(name)
+            length = int.from_bytes(meta.buf[:_HEADER], 'little')
+            if length:
+                break
+            if not publishing or time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)
+        manifest = json.loads(bytes(meta.buf[_HEADER:_HEADER + length]))
+    finally:
+        meta.close()
+    return _frame(_open(name), manifest['columns'])
+
+
+@contextmanager
+def _publish_lock(name):
+    # Yields whether the lock was taken within _PUBLISH_TIMEOUT
+    with open(_lock_path(name), 'a') as fh:
+        deadline = time.monotonic() + _PUBLISH_TIMEOUT
+        while True:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(0.05)
+        try:
+            yield True
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _lock_path(name):
+    return os.path.join(tempfile.gettempdir(), f'{name}.lock')
+
+
+def _is_locked(name):
+    try:
+        with open(_lock_path(name), 'a') as fh:
+            fcntl.flock(fh, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            fcntl.flock(fh, fcntl.LOCK_UN)
+    except BlockingIOError:
+        return True
+    return False
+
+
+def _unlink_table(name):
+    for segment in (f'{name}-manifest', name):
+        try:
+            # Left tracked: unlink() itself unregisters the segment
+            shm = shared_memory.SharedMemory(name=segment)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
+
+
+def _frame(data, columns):
+    arrays = {}
+    for spec in columns:
+        array = np.ndarray(spec['length'], np.dtype(spec['dtype']), data.buf, spec['offset'])
+        array.flags.writeable = False
+        if 'categories' in spec:
+            dtype = pd.CategoricalDtype(spec['categories'], ordered=spec['ordered'])
+            array = pd.Categorical.from_codes(array, dtype=dtype, validate=False)
+        arrays[spec['name']] = array
+    # The views borrow the mapping, so keep it open for the process lifetime
+    _MAPPINGS.append(data)
+    return pd.DataFrame(arrays, copy=False)
+
+
+def _create(name, size):
+    shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+    _untrack(shm)
+    return shm
+
+
+def _open(name):
+    shm = shared_memory.SharedMemory(name=name)
+    _untrack(shm)
+    return shm
+
+
+def _untrack(shm):
+    # The resource tracker unlinks every segment a process touched when
+    # that process exits, which would pull the table out from under the
+    # other workers; lifetime is managed explicitly through unlink()
+    resource_tracker.unregister(shm._name, 'shared_memory')
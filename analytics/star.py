@@ -0,0 +1,62 @@
+"""Star-schema view of the sales fact table and the customer dimension.
+
+Instead of joining every customer attribute onto every order, the fact table
+carries a ``CustomerPos`` column: the integer row position of the order's
+customer in the customer table. Attributes are fetched by position only for
+the rows a chart actually needs.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+CUSTOMER_ATTRIBUTES = ['Age', 'Gender', 'JoinDate', 'LoyaltyTier']
+
+
+@dataclass(frozen=True)
+class StarSchema:
+    sales: pd.DataFrame
+    customers: pd.DataFrame
+
+    def lookup(self, name, rows):
+        """Customer attribute ``name`` for each order in ``rows``.
+
+        Orders whose customer is missing from the dimension get a missing
+        value, as a left join would give them.
+        """
+        positions = rows['CustomerPos'].to_numpy()
+        values = pd.api.extensions.take(self.customers[name].array, positions, allow_fill=True)
+        return pd.Series(values, index=rows.index, name=name)
+
+    def with_customers(self, rows, columns=CUSTOMER_ATTRIBUTES):
+        """``rows`` with customer attributes attached, shaped like the old
+        ``pd.merge(sales_df, customer_df)`` output."""
+        joined = rows.drop(columns='CustomerPos')
+        return joined.assign(**{name: self.lookup(name, rows) for name in columns})
+
+    def customers_of(self, rows):
+        """Distinct customers that placed at least one order in ``rows``."""
+        positions = np.unique(rows['CustomerPos'].to_numpy())
+        return self.customers.iloc[positions[positions >= 0]]
+
+
+def build_star_schema(sales_df, customer_df):
+    """Attach ``CustomerPos`` to ``sales_df`` and pair it with ``customer_df``.
+
+    The fact table is returned sorted by Date so it can be range-sliced
+    through a :class:`~analytics.indexes.DateIndex`.
+    """
+    if not sales_df['Date'].is_monotonic_increasing:
+        sales_df = sales_df.sort_values('Date', kind='stable', ignore_index=True)
+    if not customer_df['CustomerID'].is_monotonic_increasing:
+        customer_df = customer_df.sort_values('CustomerID', ignore_index=True)
+
+    customer_ids = customer_df['CustomerID'].to_numpy()
+    order_ids = sales_df['CustomerID'].to_numpy()
+    positions = np.searchsorted(customer_ids, order_ids).astype(np.int32)
+    found = positions < len(customer_ids)
+    found[found] = customer_ids[positions[found]] == order_ids[found]
+    positions[~found] = -1
+
+    return StarSchema(sales=sales_df.assign(CustomerPos=positions), customers=customer_df)
@@ -0,0 +1,173 @@
+"""Date-partitioned Parquet copies of the sales and customer tables.
+
+Each dataset lives under ``<data_dir>/<dataset_key>/`` so that changing the
+generator settings never reads back stale data::
+
+    <data_dir>/<dataset_key>/sales/month=202301/part-0.parquet
+    <data_dir>/<dataset_key>/customers.parquet
+    <data_dir>/<dataset_key>/snapshot/sales.arrow
+    <data_dir>/<dataset_key>/snapshot/customers.arrow
+
+Sales are partitioned by calendar month (``YYYYMM``) and stay sorted by
+``Date`` inside each file, so a date range prunes whole partitions and the
+row-group statistics on ``Date`` skip the rest.
+
+The snapshot is an uncompressed Arrow IPC (Feather v2) copy of both tables,
+written as a single record batch each. It is memory-mapped on read and
+converted to pandas without copying, so opening it costs the same at any
+size, and pages only fault in when a column is actually touched.
+"""
+
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+SALES_DIR = 'sales'
+CUSTOMERS_FILE = 'customers.parquet'
+SNAPSHOT_DIR = 'snapshot'
+SNAPSHOT_TABLES = ('sales', 'customers')
+PARTITION_COLUMN = 'month'
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.int32())]), flavor='hive')
+
+
+def dataset_path(data_dir, config):
+    return Path(data_dir) / config.dataset_key()
+
+
+def has_tables(data_dir, config):
+    return (dataset_path(data_dir, config) / CUSTOMERS_FILE).exists()
+
+
+def write_tables(data_dir, config, sales_df, customer_df):
+    """Persist both tables for ``config``.
+
+    The files are written to a scratch directory and renamed into place, so
+    replicas starting at the same time never see a half-written dataset; if
+    another process got there first its copy is kept.
+    """
+    target = dataset_path(data_dir, config)
+    scratch = target.with_name(f'.{target.name}-{uuid.uuid4().hex}')
+
+    sales = pa.Table.from_pandas(sales_df, preserve_index=False)
+    month = pc.add(pc.multiply(pc.year(sales['Date']), 100), pc.month(sales['Date'])).cast(pa.int32())
+    ds.write_dataset(
+        sales.append_column(PARTITION_COLUMN, month),
+        scratch / SALES_DIR,
+        format='parquet',
+        partitioning=PARTITIONING,
+        basename_template='part-{i}.parquet',
+        max_rows_per_group=256 * 1024,
+    )
+    pq.write_table(pa.Table.from_pandas(customer_df, preserve_index=False), scratch / CUSTOMERS_FILE)
+
+    try:
+        os.rename(scratch, target)
+    except OSError:
+        if not has_tables(data_dir, config):
+            raise
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def read_sales(data_dir, config, columns=None, start=None, end=None):
+    """Read the sales table, optionally projected to ``columns`` and limited
+    to ``start <= Date <= end`` (either bound may be omitted)."""
+    dataset = ds.dataset(dataset_path(data_dir, config) / SALES_DIR, format='parquet', partitioning=PARTITIONING)
+    columns = columns or [name for name in dataset.schema.names if name != PARTITION_COLUMN]
+
+    # The month clauses prune partitions; the Date clauses are pushed down
+    # to the row-group statistics inside the surviving files
+    predicate = None
+    if start is not None:
+        start = pd.Timestamp(start)
+        predicate = _and(predicate, (ds.field(PARTITION_COLUMN) >= _month_key(start))
+                         & (ds.field('Date') >= pa.scalar(start.to_pydatetime())))
+    if end is not None:
+        end = pd.Timestamp(end)
+        predicate = _and(predicate, (ds.field(PARTITION_COLUMN) <= _month_key(end))
+                         & (ds.field('Date') <= pa.scalar(end.to_pydatetime())))
+
+    table = dataset.to_table(columns=columns, filter=predicate)
+    # Fragments come back in path order, which is YYYYMM order, but callers
+    # rely on Date being monotonic so check rather than assume
+    if 'Date' in table.column_names and not _is_sorted(table['Date']):
+        table = table.sort_by('Date')
+    return table.to_pandas()
+
+
+def read_customers(data_dir, config, columns=None):
+    return pq.read_table(dataset_path(data_dir, config) / CUSTOMERS_FILE, columns=columns).to_pandas()
+
+
+def read_categories(data_dir, config):
+    """``{column: categories}`` for the categorical columns of both tables,
+    in their stored order, without reading more than one row of each."""
+    path = dataset_path(data_dir, config)
+    tables = [
+        ds.dataset(path / SALES_DIR, format='parquet', partitioning=PARTITIONING).head(1),
+        pq.ParquetFile(path / CUSTOMERS_FILE).read_row_group(0).slice(0, 1),
+    ]
+    categories = {}
+    for table in tables:
+        for name in table.column_names:
+            if pa.types.is_dictionary(table.schema.field(name).type) and table[name].num_chunks:
+                categories[name] = table[name].chunk(0).dictionary.to_pylist()
+    return categories
+
+
+def has_snapshot(data_dir, config):
+    directory = dataset_path(data_dir, config) / SNAPSHOT_DIR
+    return all((directory / f'{table}.arrow').exists() for table in SNAPSHOT_TABLES)
+
+
+def write_snapshot(data_dir, config, sales_df, customer_df):
+    """Write the Arrow IPC snapshot of both tables.
+
+    Each file is written under a scratch name and renamed over the target,
+    so a reader maps either the old file or the complete new one.
+    """
+    directory = dataset_path(data_dir, config) / SNAPSHOT_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    for table, frame in zip(SNAPSHOT_TABLES, (sales_df, customer_df)):
+        arrow = pa.Table.from_pandas(frame, preserve_index=False).combine_chunks()
+        scratch = directory / f'.{table}-{uuid.uuid4().hex}.arrow'
+        # One record batch per file: a chunked column would have to be
+        # concatenated, i.e. copied, on the way to pandas
+        feather.write_feather(arrow, scratch, compression='uncompressed', chunksize=max(len(arrow), 1))
+        os.replace(scratch, directory / f'{table}.arrow')
+
+
+def read_snapshot(data_dir, config):
+    """``(sales_df, customer_df)`` as zero-copy views of the memory-mapped
+    snapshot files."""
+    directory = dataset_path(data_dir, config) / SNAPSHOT_DIR
+    frames = []
+    for table in SNAPSHOT_TABLES:
+        with pa.memory_map(str(directory / f'{table}.arrow')) as source:
+            arrow = pa.ipc.open_file(source).read_all()
+        # split_blocks skips pandas' block consolidation, which would copy
+        # every column into a 2-D array; the buffers keep the map alive
+        frames.append(arrow.to_pandas(split_blocks=True))
+    return tuple(frames)
+
+
+def _month_key(timestamp):
+    return timestamp.year * 100 + timestamp.month
+
+
+def _and(predicate, clause):
+    return clause if predicate is None else predicate & clause
+
+
+def _is_sorted(column):
+    if len(column) < 2:
+        return True
+    column = column.combine_chunks()
+    return pc.all(pc.greater_equal(column[1:], column[:-1])).as_py()
@@ -0,0 +1,101 @@
+"""Integer period keys for grouping day-level data into coarser buckets.
+
+Days are counted from the Unix epoch. Every period is an integer computed
+with array arithmetic (no per-row strings), so grouping by week or month
+costs the same as grouping by day; labels are only produced for the buckets
+that come out the other end.
+
+Weeks are ISO weeks: they start on Monday and are labelled with the ISO
+year, so the days around New Year land in the right ``YYYY-Www`` bucket.
+"""
+
+import numpy as np
+import pandas as pd
+
+FREQUENCIES = ('day', 'week', 'month', 'quarter')
+
+# 1970-01-01 was a Thursday; shifting by three days puts Mondays on a
+# multiple of seven
+_MONDAY_SHIFT = 3
+
+
+def epoch_days(dates):
+    """Days since 1970-01-01 for datetime-like ``dates``."""
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+def period_codes(days, freq):
+    """Integer code of the ``freq`` period containing each epoch day."""
+    days = np.asarray(days, dtype=np.int64)
+    if freq == 'day':
+        return days
+    if freq == 'week':
+        return (days + _MONDAY_SHIFT) // 7
+    months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    if freq == 'month':
+        return months
+    if freq == 'quarter':
+        return months // 3
+    raise ValueError(f"freq must be one of {FREQUENCIES}")
+
+
+def period_start(codes, freq):
+    """First day of each period as ``datetime64[D]``."""
+    codes = np.asarray(codes, dtype=np.int64)
+    if freq == 'day':
+        return codes.astype('datetime64[D]')
+    if freq == 'week':
+        return (codes * 7 - _MONDAY_SHIFT).astype('datetime64[D]')
+    months = codes * 3 if freq == 'quarter' else codes
+    return months.astype('datetime64[M]').astype('datetime64[D]')
+
+
+def period_labels(codes, freq):
+    """Human-readable label for each period code."""
+    starts = pd.DatetimeIndex(period_start(codes, freq))
+    if freq == 'day':
+        return list(starts.strftime('%Y-%m-%d'))
+    if freq == 'week':
+        iso = starts.isocalendar()
+        return [f'{year}-W{week:02d}' for year, week in zip(iso['year'], iso['week'])]
+    if freq == 'month':
+        return list(starts.strftime('%Y-%m'))
+    return [f'{start.year}-Q{(start.month - 1) // 3 + 1}' for start in starts]
+
+
+def bucket_sums(days, values, freq):
+    """Sum ``values`` per ``freq`` period of the epoch ``days``.
+
+    Returns a frame with the period ``Label``, its first day as ``Date`` and
+    the summed ``Value``, for periods that contain at least one day.
+    """
+    codes = period_codes(days, freq)
+    if len(codes) == 0:
+        return pd.DataFrame({'Label': [], 'Date': np.array([], dtype='datetime64[us]'), 'Value': []})
+    first = codes.min()
+    sums = np.bincount(codes - first, weights=values)
+    present = np.flatnonzero(np.bincount(codes - first))
+    return pd.DataFrame({
+        'Label': period_labels(present + first, freq),
+        'Date': period_start(present + first, freq).astype('datetime64[us]'),
+        'Value': sums[present],
+    })
+
+
+def range_sums(first_day, daily, freq):
+    """Sum a dense run of ``daily`` values, starting at epoch day
+    ``first_day``, per ``freq`` period.
+
+    Unlike :func:`bucket_sums`, every period the run touches is reported,
+    including those that sum to zero.
+    """
+    daily = np.asarray(daily, dtype=np.float64)
+    if len(daily) == 0:
+        return pd.DataFrame({'Label': [], 'Date': np.array([], dtype='datetime64[us]'), 'Value': []})
+    codes = period_codes(np.arange(len(daily)) + first_day, freq)
+    starts = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+    return pd.DataFrame({
+        'Label': period_labels(codes[starts], freq),
+        'Date': period_start(codes[starts], freq).astype('datetime64[us]'),
+        'Value': np.add.reduceat(daily, starts),
+    })
@@ -0,0 +1,84 @@
+"""Per-figure build and serialization time, plotly.express vs analytics.charts.
+
+Frames are shaped like the dashboard's aggregates: a few products, regions
+and loyalty tiers, twenty age bins and a two-year daily trend. Run from the
+repository root:
+
+    python -m benchmarks.bench_charts [--repeat N]
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+
+from analytics import charts
+
+rng = np.random.default_rng(0)
+products = pd.DataFrame({
+    'Product': ['Laptop', 'Smartphone', 'Tablet', 'Headphones', 'Monitor', 'Keyboard'],
+    'Revenue': rng.uniform(1e5, 2e6, 6),
+    'Quantity': rng.integers(100, 5000, 6),
+})
+regions = pd.DataFrame({
+    'Region': ['North', 'South', 'East', 'West'],
+    'Revenue': rng.uniform(1e6, 2e6, 4),
+    'CustomerID': rng.integers(500, 2000, 4),
+    'lat': [45.0, 30.0, 38.0, 40.0],
+    'lon': [-95.0, -90.0, -80.0, -115.0],
+})
+ages = pd.DataFrame({'Label': [f'{18 + 3 * i}–{20 + 3 * i}' for i in range(20)],
+                     'count': rng.integers(50, 300, 20)})
+days = pd.date_range('2023-01-01', '2024-12-31')
+trend = pd.DataFrame({'Date': days, 'Revenue': rng.uniform(5e3, 2e4, len(days)),
+                      'Label': days.strftime('%Y-%m-%d')})
+
+FIGURES = {
+    'bar': (products, dict(x='Product', y='Revenue', color='Product', title="Revenue by Product",
+                           labels={'Revenue': 'Revenue ($)'}, height=400)),
+    'bar (histogram)': (ages, dict(x='Label', y='count', title="Customer Age Distribution",
+                                   labels={'Label': 'Age'}, height=400)),
+    'pie': (products, dict(names='Product', values='Revenue', hole=0.3, height=400)),
+    'line': (trend, dict(x='Date', y='Revenue', title="Daily Sales Trend", labels={'Revenue': 'Revenue ($)'},
+                         hover_data={'Label': True, 'Date': False}, height=400)),
+    'scatter_geo': (regions, dict(lat='lat', lon='lon', size='Revenue', color='Region', hover_name='Region',
+                                  hover_data=['Revenue', 'CustomerID'], projection='natural earth',
+                                  title="Revenue by Region", height=500)),
+}
+
+
+def best_ms(func, repeat):
+    # Best of several rounds, to leave out interference from the rest of the machine
+    number = max(1, repeat // 5)
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50, help="builds timed per figure")
+    args = parser.parse_args()
+
+    # pio json is plotly's own encoder (fig.to_dict() plus json), orjson is
+    # charts.to_json
+    print(f"{'figure':<18}{'px build':>11}{'go build':>11}{'pio json':>11}{'orjson':>9}  (ms)")
+    for name, (frame, params) in FIGURES.items():
+        kind = name.split()[0]
+        express = getattr(px, kind)
+        builder = getattr(charts, kind)
+        fig = builder(frame, **params)
+        timings = [
+            best_ms(lambda: express(frame, **params), args.repeat),
+            best_ms(lambda: builder(frame, **params), args.repeat),
+            best_ms(lambda: pio.to_json(fig, validate=False, engine='json'), args.repeat),
+            best_ms(lambda: charts.to_json(fig), args.repeat),
+        ]
+        print(f"{name:<18}" + ''.join(f"{value:>{width}.2f}" for value, width in zip(timings, (11, 11, 11, 9))))
+    if charts.orjson is None:
+        print("orjson is not installed; charts.to_json fell back to plotly's encoder")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,23 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from analytics import charts, shared_store, storage
+from analytics.backends import MemoryBackend
+from analytics.backends.duckdb_backend import DuckDBBackend
+from analytics.backends.polars_backend import PolarsBackend
+from analytics.config import load_config
+from analytics.cube import DailyCube
+from analytics.figure_cache import cached_figure
+from analytics.filter_cache import LRUCache
+from analytics.datagen import generate_customers, generate_sales, region_coordinates
+from analytics.downsample import lttb_indices
+from analytics.histograms import integer_bins
+from analytics.hll import precision_for_error
+from analytics.indexes import BitmapIndex, DateIndex
+from analytics.rollups import RevenuePrefixSums
+from analytics.schema import compact_customers, compact_sales
+from analytics.star import build_star_schema
 
 # Set page configuration
 st.set_page_config(
@@ -13,100 +27,205 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Dataset scale comes from ECOM_* env vars or the TOML file in ECOM_CONFIG
+config = load_config()
+
 # Load sample data (in a real app, this would connect to a database)
-@st.cache_data
-def load_data():
-    # Generate sample sales data
-    np.random.seed(42)
-    date_range = pd.date_range(start='2023-01-01', end='2023-12-31')
-    products = ['Laptop', 'Phone', 'Tablet', 'Headphones', 'Smartwatch', 'Camera']
-    categories = ['Electronics', 'Electronics', 'Electronics', 'Accessories', 'Accessories', 'Electronics']
-    regions = ['North', 'South', 'East', 'West']
-    
-    data = []
-    for date in date_range:
-        for _ in range(np.random.randint(5, 20)):
-            product_idx = np.random.randint(0, len(products))
-            price = np.random.uniform(100, 2000)
-            quantity = np.random.randint(1, 3)
-            region = np.random.choice(regions)
-            discount = np.random.choice([0, 0.05, 0.1, 0.15, 0.2], p=[0.5, 0.2, 0.15, 0.1, 0.05])
-            
-            data.append({
-                'Date': date,
-                'Product': products[product_idx],
-                'Category': categories[product_idx],
-                'Price': price,
-                'Quantity': quantity,
-                'Revenue': price * quantity * (1 - discount),
-                'Discount': discount,
-                'Region': region,
-                'CustomerID': np.random.randint(1000, 9999)
-            })
-    
-    df = pd.DataFrame(data)
-    
-    # Generate customer data
-    customer_ids = df['CustomerID'].unique()
-    customer_data = []
-    for cust_id in customer_ids:
-        customer_data.append({
-            'CustomerID': cust_id,
-            'Age': np.random.randint(18, 70),
-            'Gender': np.random.choice(['Male', 'Female']),
-            'JoinDate': np.random.choice(pd.date_range(start='2022-01-01', end='2023-01-01')),
-            'LoyaltyTier': np.random.choice(['Bronze', 'Silver', 'Gold'], p=[0.6, 0.3, 0.1])
-        })
-    
-    customer_df = pd.DataFrame(customer_data)
-    
+# cache_resource hands every rerun the same frames instead of unpickling a
+# fresh copy each time; nothing below mutates them
+@st.cache_resource
+def load_data(config):
+    # Attach to the copy another server process already published
+    if config.shared_memory:
+        tables = shared_store.attach(config)
+        if tables is not None:
+            # The publisher may have used another data_dir, or none at all
+            persist_tables(config, *tables)
+            return tables
+    
+    df, customer_df = read_or_generate_tables(config)
+    if config.shared_memory:
+        return shared_store.publish(config, df, customer_df)
     return df, customer_df
 
-sales_df, customer_df = load_data()
+def read_or_generate_tables(config):
+    # A memory-mapped snapshot opens instantly; Parquet is the fallback
+    if config.data_dir and config.snapshot and storage.has_snapshot(config.data_dir, config):
+        df, customer_df = storage.read_snapshot(config.data_dir, config)
+        return compact_sales(df), compact_customers(customer_df)
+    
+    # Reuse the Parquet copy from an earlier process when there is one
+    if config.data_dir and storage.has_tables(config.data_dir, config):
+        df = compact_sales(storage.read_sales(config.data_dir, config))
+        customer_df = compact_customers(storage.read_customers(config.data_dir, config))
+        persist_tables(config, df, customer_df)
+        return df, customer_df
+    
+    # One seeded generator drives every draw, so reruns are reproducible
+    rng = np.random.default_rng(config.seed)
+    df = generate_sales(rng, config)
+    customer_df = generate_customers(rng, df['CustomerID'].unique(), config)
+    
+    # Narrow the column types before anything is cached or written out
+    df = compact_sales(df)
+    customer_df = compact_customers(customer_df)
+    
+    persist_tables(config, df, customer_df)
+    return df, customer_df
+
+def persist_tables(config, df, customer_df):
+    # Write whichever of the Parquet copy and the snapshot data_dir still
+    # lacks; the DuckDB and Polars backends scan the Parquet copy
+    if not config.data_dir:
+        return
+    if not storage.has_tables(config.data_dir, config):
+        storage.write_tables(config.data_dir, config, df, customer_df)
+    if config.snapshot and not storage.has_snapshot(config.data_dir, config):
+        storage.write_snapshot(config.data_dir, config, df, customer_df)
+
+# Star schema: orders carry their customer's row position, and customer
+# attributes are looked up by position only where a chart needs them
+@st.cache_resource
+def load_star_schema(config):
+    sales_df, customer_df = load_data(config)
+    return build_star_schema(sales_df, customer_df)
+
+# Day-offset index over the Date-sorted fact table, so a date range is a
+# zero-copy row slice rather than two full-column comparisons
+@st.cache_resource
+def load_date_index(config):
+    return DateIndex(load_star_schema(config).sales['Date'])
 
-# Merge data
-merged_df = pd.merge(sales_df, customer_df, on='CustomerID', how='left')
+# Per-value bitmaps answer the multiselect filters without string compares
+@st.cache_resource
+def load_bitmap_index(config):
+    return BitmapIndex(load_star_schema(config).sales, ['Category', 'Product', 'Region'])
+
+# Daily Date x Product x Region x LoyaltyTier x Gender rollup that answers
+# every sum/count on the dashboard
+@st.cache_resource
+def load_cube(config):
+    return DailyCube(load_star_schema(config), load_date_index(config))
+
+# Running daily revenue per (Product, Region), so any range and grouping of
+# the sales trend is a handful of prefix-sum differences
+@st.cache_resource
+def load_revenue_prefix(config):
+    return RevenuePrefixSums(load_cube(config))
+
+# HyperLogLog sketch of CustomerID per cube cell, built on first use of
+# approximate distinct counts
+@st.cache_resource
+def load_customer_sketches(config):
+    return load_cube(config).customer_sketches(load_star_schema(config), precision_for_error(config.hll_error))
+
+# Filter results and the aggregates derived from them, shared by every
+# session and evicted least-recently-used once the byte budget is hit
+@st.cache_resource
+def load_filter_cache(config):
+    return LRUCache(config.filter_cache_mb * 2**20)
+
+# Serialized chart figures, keyed on the aggregate each one plots
+@st.cache_resource
+def load_figure_cache(config):
+    return LRUCache(config.figure_cache_mb * 2**20)
+
+# Query engine behind every KPI, chart and export. The in-memory engine
+# answers from the indexes and cube above; DuckDB and Polars scan the
+# Parquet copy out of core when there is one. Their tables are read or
+# generated without load_data, whose cache would keep the frames alive
+# next to the engine's own copy
+@st.cache_resource
+def load_backend(config):
+    engines = {'duckdb': DuckDBBackend, 'polars': PolarsBackend}
+    if config.query_backend in engines:
+        engine = engines[config.query_backend]
+        if config.data_dir:
+            if not storage.has_tables(config.data_dir, config):
+                read_or_generate_tables(config)
+            return engine.from_parquet(config.data_dir, config)
+        return engine.from_frames(*read_or_generate_tables(config))
+    return MemoryBackend(
+        load_star_schema(config),
+        load_date_index(config),
+        load_bitmap_index(config),
+        load_cube(config),
+        load_revenue_prefix(config),
+        sketches=lambda: load_customer_sketches(config),
+        sketch_precision=precision_for_error(config.hll_error),
+        cache=load_filter_cache(config)
+    )
+
+backend = load_backend(config)
+filter_cache = load_filter_cache(config)
+figure_cache = load_figure_cache(config)
+filter_options = backend.options()
 
 # Sidebar filters
 st.sidebar.header("Filters")
+data_start = datetime.fromisoformat(config.start_date)
+data_end = datetime.fromisoformat(config.end_date)
 date_range = st.sidebar.date_input(
     "Date range",
-    value=[datetime(2023, 1, 1), datetime(2023, 12, 31)],
-    min_value=datetime(2023, 1, 1),
-    max_value=datetime(2023, 12, 31)
+    value=[data_start, data_end],
+    min_value=data_start,
+    max_value=data_end
 )
 
 if len(date_range) == 2:
     start_date, end_date = date_range
-    filtered_df = merged_df[(merged_df['Date'] >= pd.to_datetime(start_date)) & 
-                           (merged_df['Date'] <= pd.to_datetime(end_date))]
 else:
-    filtered_df = merged_df.copy()
+    start_date = end_date = None
 
 selected_categories = st.sidebar.multiselect(
     "Categories",
-    options=filtered_df['Category'].unique(),
-    default=filtered_df['Category'].unique()
+    options=filter_options['Category'],
+    default=filter_options['Category']
 )
 
 selected_products = st.sidebar.multiselect(
     "Products",
-    options=filtered_df['Product'].unique(),
-    default=filtered_df['Product'].unique()
+    options=filter_options['Product'],
+    default=filter_options['Product']
 )
 
 selected_regions = st.sidebar.multiselect(
     "Regions",
-    options=filtered_df['Region'].unique(),
-    default=filtered_df['Region'].unique()
+    options=filter_options['Region'],
+    default=filter_options['Region']
+)
+
+# The error bound is the engine's own: DuckDB and Polars ignore hll_error
+approximate_error = backend.approximate_error()
+approximate_distinct = st.sidebar.toggle(
+    "Approximate distinct counts",
+    value=config.distinct_counts == 'approximate',
+    help="Count unique customers from HyperLogLog sketches "
+         + (f"(about ±{approximate_error:.1%} error) " if approximate_error is not None else "")
+         + "instead of scanning orders"
 )
 
-# Apply filters
-filtered_df = filtered_df[
-    (filtered_df['Category'].isin(selected_categories)) &
-    (filtered_df['Product'].isin(selected_products)) &
-    (filtered_df['Region'].isin(selected_regions))
-]
+# Apply filters: the normalised filter is hashable, so every result derived
+# from it is cached once and shared by all sessions
+selected = backend.filter(start_date, end_date, {
+    'Category': selected_categories,
+    'Product': selected_products,
+    'Region': selected_regions
+})
+
+def query(*calls):
+    # Results of backend calls such as ('by', 'Region') on the current
+    # filter; those not in the shared cache run together as one batch
+    keys = [(backend.name, selected, call) for call in calls]
+    return filter_cache.get_or_compute_many(keys, lambda missing: {
+        (backend.name, selected, call): result
+        for call, result in backend.batch(selected, [key[2] for key in missing]).items()
+    })
+
+def chart(build, frame, **params):
+    # build(frame, **params), e.g. charts.bar, reused while the frame and the
+    # chart parameters stay the same
+    return cached_figure(figure_cache, build, frame, **params)
 
 # Main dashboard
 st.title("📊 E-Commerce Analytics Dashboard")
@@ -116,13 +235,17 @@ st.markdown("""
 """)
 
 # KPI cards
+total_revenue, total_orders, unique_customers = query(
+    ('total', 'Revenue'),
+    ('total', 'Orders'),
+    ('distinct_customers', approximate_distinct)
+)
+
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    total_revenue = filtered_df['Revenue'].sum()
     st.metric("Total Revenue", f"${total_revenue:,.2f}")
 
 with col2:
-    total_orders = len(filtered_df)
     st.metric("Total Orders", f"{total_orders:,}")
 
 with col3:
@@ -130,51 +253,86 @@ with col3:
     st.metric("Avg. Order Value", f"${avg_order_value:,.2f}")
 
 with col4:
-    unique_customers = filtered_df['CustomerID'].nunique()
     st.metric("Unique Customers", f"{unique_customers:,}")
 
-# Tabs for different sections
-tab1, tab2, tab3, tab4 = st.tabs(["Sales Overview", "Product Analysis", "Customer Insights", "Geographic View"])
+TIME_GROUPS = {"Daily": 'day', "Weekly": 'week', "Monthly": 'month', "Quarterly": 'quarter'}
 
-with tab1:
-    st.subheader("Sales Trend")
-    
-    # Daily/Weekly/Monthly selector
+def keep_choice(key):
+    # Streamlit drops the state of widgets in a tab that is not rendered, so
+    # tab-local choices are mirrored into a plain session_state key that
+    # seeds the widget again when its tab comes back
+    st.session_state[f"{key}_choice"] = st.session_state[key]
+
+# Tab-local widgets live in fragments: changing them reruns just the
+# fragment with the arguments it was last called with, not the whole script
+@st.fragment
+def sales_trend_chart(selected):
+    # Daily/Weekly/Monthly/Quarterly selector
+    time_groups = list(TIME_GROUPS)
     time_group = st.radio(
         "Time grouping",
-        ["Daily", "Weekly", "Monthly"],
-        horizontal=True
+        time_groups,
+        index=time_groups.index(st.session_state.get("time_group_choice", time_groups[0])),
+        horizontal=True,
+        key="time_group",
+        on_change=keep_choice,
+        args=("time_group",)
     )
     
-    if time_group == "Daily":
-        time_format = "%Y-%m-%d"
-        group_col = 'Date'
-    elif time_group == "Weekly":
-        time_format = "%Y-%U"
-        group_col = filtered_df['Date'].dt.strftime(time_format)
-    else:  # Monthly
-        time_format = "%Y-%m"
-        group_col = filtered_df['Date'].dt.strftime(time_format)
-    
-    sales_trend = filtered_df.groupby(group_col)['Revenue'].sum().reset_index()
+    # Buckets are plotted at their first day; only the buckets get a text label
+    freq = TIME_GROUPS[time_group]
+    sales_trend = filter_cache.get_or_compute(
+        (backend.name, selected, ('trend', freq)),
+        lambda: backend.trend(selected, freq)
+    )
     
-    fig = px.line(
+    # Long series are cut to about one point per pixel with LTTB, which
+    # keeps the peaks that plain striding would drop
+    if len(sales_trend) > config.max_trend_points and not st.toggle(
+        "Show every point",
+        value=st.session_state.get("trend_every_point_choice", False),
+        key="trend_every_point",
+        help=f"Long trends are downsampled to {config.max_trend_points:,} points",
+        on_change=keep_choice,
+        args=("trend_every_point",)
+    ):
+        sales_trend = sales_trend.iloc[lttb_indices(sales_trend['Date'], sales_trend['Revenue'],
+                                                    config.max_trend_points)]
+    
+    fig = chart(
+        charts.line,
         sales_trend,
-        x=group_col,
+        x='Date',
         y='Revenue',
         title=f"{time_group} Sales Trend",
-        labels={'Revenue': 'Revenue ($)', group_col: 'Date'},
+        labels={'Revenue': 'Revenue ($)'},
+        hover_data={'Label': True, 'Date': False},
         height=400
     )
     st.plotly_chart(fig, use_container_width=True)
+
+
+def with_customers(metrics, customers, position):
+    # Copy of a per-value frame with its distinct customer counts inserted
+    metrics = metrics.copy()
+    metrics.insert(position, 'CustomerID', customers.reindex(metrics.iloc[:, 0]).to_numpy())
+    return metrics
+
+
+# Tab bodies are functions so only the selected tab's figures get built
+def render_sales_overview():
+    # Sales trend and revenue by category.
+    st.subheader("Sales Trend")
+    sales_trend_chart(selected)
     
     # Revenue by category
     st.subheader("Revenue by Category")
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        category_revenue = filtered_df.groupby('Category')['Revenue'].sum().reset_index()
-        fig = px.pie(
+        category_revenue = query(('by', 'Category'))[0][['Category', 'Revenue']]
+        fig = chart(
+            charts.pie,
             category_revenue,
             names='Category',
             values='Revenue',
@@ -190,17 +348,17 @@ with tab1:
             use_container_width=True
         )
 
-with tab2:
+
+def render_product_analysis():
+    # Revenue, units and discount per product.
     st.subheader("Product Performance")
     
     # Top products by revenue
-    top_products = filtered_df.groupby('Product').agg({
-        'Revenue': 'sum',
-        'Quantity': 'sum',
-        'Discount': 'mean'
-    }).sort_values('Revenue', ascending=False).reset_index()
+    top_products = query(('by', 'Product'))[0][['Product', 'Revenue', 'Quantity', 'Discount']] \
+        .sort_values('Revenue', ascending=False, ignore_index=True)
     
-    fig = px.bar(
+    fig = chart(
+        charts.bar,
         top_products,
         x='Product',
         y='Revenue',
@@ -216,7 +374,8 @@ with tab2:
     
     with col1:
         st.subheader("Units Sold by Product")
-        fig = px.bar(
+        fig = chart(
+            charts.bar,
             top_products,
             x='Product',
             y='Quantity',
@@ -228,7 +387,8 @@ with tab2:
     
     with col2:
         st.subheader("Average Discount by Product")
-        fig = px.bar(
+        fig = chart(
+            charts.bar,
             top_products,
             x='Product',
             y='Discount',
@@ -238,26 +398,41 @@ with tab2:
         )
         st.plotly_chart(fig, use_container_width=True)
 
-with tab3:
+
+def render_customer_insights():
+    # Customer demographics and loyalty tiers.
     st.subheader("Customer Demographics")
     
+    # Distributions are counted over the customers active in the filter,
+    # not over their orders
+    age_counts, gender_counts, loyalty_metrics, loyalty_customers = query(
+        ('customer_distribution', 'Age'),
+        ('customer_distribution', 'Gender'),
+        ('by', 'LoyaltyTier'),
+        ('distinct_customers_by', 'LoyaltyTier', approximate_distinct)
+    )
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        # Age distribution
-        fig = px.histogram(
-            filtered_df.drop_duplicates('CustomerID'),
-            x='Age',
-            nbins=20,
+        # Age distribution, binned here so only the bin counts are sent
+        fig = chart(
+            charts.bar,
+            integer_bins(age_counts, n_bins=20),
+            x='Label',
+            y='count',
             title="Customer Age Distribution",
-            height=400
+            labels={'Label': 'Age'},
+            height=400,
+            bargap=0
         )
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Gender distribution
-        gender_dist = filtered_df.drop_duplicates('CustomerID')['Gender'].value_counts().reset_index()
-        fig = px.pie(
+        gender_dist = gender_counts.reset_index()
+        fig = chart(
+            charts.pie,
             gender_dist,
             names='Gender',
             values='count',
@@ -268,16 +443,13 @@ with tab3:
     
     st.subheader("Loyalty Tier Analysis")
     
-    loyalty_metrics = filtered_df.groupby('LoyaltyTier').agg({
-        'CustomerID': 'nunique',
-        'Revenue': 'sum',
-        'Discount': 'mean'
-    }).reset_index()
+    loyalty_metrics = with_customers(loyalty_metrics[['LoyaltyTier', 'Revenue', 'Discount']], loyalty_customers, 1)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.bar(
+        fig = chart(
+            charts.bar,
             loyalty_metrics,
             x='LoyaltyTier',
             y='CustomerID',
@@ -289,7 +461,8 @@ with tab3:
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        fig = px.bar(
+        fig = chart(
+            charts.bar,
             loyalty_metrics,
             x='LoyaltyTier',
             y='Revenue',
@@ -300,19 +473,22 @@ with tab3:
         )
         st.plotly_chart(fig, use_container_width=True)
 
-with tab4:
+
+def render_geographic_view():
+    # Regional revenue, customers and map.
     st.subheader("Regional Performance")
     
-    region_metrics = filtered_df.groupby('Region').agg({
-        'Revenue': 'sum',
-        'CustomerID': 'nunique',
-        'Quantity': 'sum'
-    }).reset_index()
+    region_metrics, region_customers = query(
+        ('by', 'Region'),
+        ('distinct_customers_by', 'Region', approximate_distinct)
+    )
+    region_metrics = with_customers(region_metrics[['Region', 'Revenue', 'Quantity']], region_customers, 2)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.bar(
+        fig = chart(
+            charts.bar,
             region_metrics,
             x='Region',
             y='Revenue',
@@ -324,7 +500,8 @@ with tab4:
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        fig = px.bar(
+        fig = chart(
+            charts.bar,
             region_metrics,
             x='Region',
             y='CustomerID',
@@ -339,18 +516,14 @@ with tab4:
     st.subheader("Regional Distribution")
     
     # Create a simple map with region centers (in a real app, you'd use actual coordinates)
-    region_coords = {
-        'North': {'lat': 40, 'lon': -100},
-        'South': {'lat': 30, 'lon': -100},
-        'East': {'lat': 35, 'lon': -75},
-        'West': {'lat': 35, 'lon': -120}
-    }
+    region_coords = region_coordinates(filter_options['Region'])
     
     map_df = region_metrics.copy()
     map_df['lat'] = map_df['Region'].map(lambda x: region_coords[x]['lat'])
     map_df['lon'] = map_df['Region'].map(lambda x: region_coords[x]['lon'])
     
-    fig = px.scatter_geo(
+    fig = chart(
+        charts.scatter_geo,
         map_df,
         lat='lat',
         lon='lon',
@@ -360,29 +533,58 @@ with tab4:
         hover_data=['Revenue', 'CustomerID'],
         projection='natural earth',
         title="Revenue by Region",
-        height=500
-    )
-    
-    fig.update_geos(
-        visible=False,
-        showcountries=True,
-        showcoastlines=True,
-        showland=True,
-        fitbounds="locations"
+        height=500,
+        geo=dict(
+            visible=False,
+            showcountries=True,
+            showcoastlines=True,
+            showland=True,
+            fitbounds="locations"
+        )
     )
     
     st.plotly_chart(fig, use_container_width=True)
-    
-    
+
+
+# Tabs for different sections. on_change="rerun" makes the selected tab part
+# of the script state, so hidden tabs are skipped instead of rendered unseen
+TABS = {
+    "Sales Overview": render_sales_overview,
+    "Product Analysis": render_product_analysis,
+    "Customer Insights": render_customer_insights,
+    "Geographic View": render_geographic_view
+}
+for tab, render_tab in zip(st.tabs(list(TABS), key="active_tab", on_change="rerun"), TABS.values()):
+    if tab.open:
+        with tab:
+            render_tab()
 
 
 # Raw data view
 st.sidebar.header("Data Export")
+with st.sidebar.expander("Memory usage"):
+    usage = backend.memory_usage()
+    if not usage:
+        st.caption("Tables are scanned from Parquet; none are held in memory")
+    for name, report in usage.items():
+        st.caption(name)
+        st.dataframe(report, hide_index=True, use_container_width=True)
+    cache_stats = filter_cache.stats()
+    st.caption(
+        f"Filter cache: {cache_stats['hits']:,} hits, {cache_stats['misses']:,} misses, "
+        f"{cache_stats['entries']:,} entries, {cache_stats['bytes'] / 2**20:.1f} MiB"
+    )
+    figure_stats = figure_cache.stats()
+    st.caption(
+        f"Figure cache: {figure_stats['hits']:,} hits, {figure_stats['misses']:,} misses, "
+        f"{figure_stats['entries']:,} entries, {figure_stats['bytes'] / 2**20:.1f} MiB"
+    )
+
 if st.sidebar.checkbox("Show raw data"):
     st.subheader("Raw Data Preview")
-    st.dataframe(filtered_df.head(100), use_container_width=True)
+    st.dataframe(backend.orders(selected, limit=100), use_container_width=True)
     
-    csv = filtered_df.to_csv(index=False).encode('utf-8')
+    csv = backend.orders(selected).to_csv(index=False).encode('utf-8')
     st.sidebar.download_button(
         "Download as CSV",
         data=csv,
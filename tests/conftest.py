@@ -0,0 +1,41 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from analytics.config import DataConfig
+from analytics.datagen import generate_customers, generate_sales
+from analytics.indexes import DateIndex
+from analytics.schema import compact_customers, compact_sales
+from analytics.star import build_star_schema
+
+
+@pytest.fixture(scope='session')
+def config():
+    # Six weeks across New Year, so ISO week 2020-W53 spans two calendar years
+    return replace(DataConfig(), start_date='2020-12-01', end_date='2021-01-15', n_customers=800)
+
+
+@pytest.fixture(scope='session')
+def tables(config):
+    rng = np.random.default_rng(config.seed)
+    sales = compact_sales(generate_sales(rng, config))
+    customers = compact_customers(generate_customers(rng, sales['CustomerID'].unique(), config))
+    # Some orders have no customer row, as after a partial customer import
+    return sales, customers.iloc[:-20].reset_index(drop=True)
+
+
+@pytest.fixture(scope='session')
+def merged(tables):
+    sales, customers = tables
+    return sales.merge(customers, on='CustomerID', how='left')
+
+
+@pytest.fixture(scope='session')
+def star(tables):
+    return build_star_schema(*tables)
+
+
+@pytest.fixture(scope='session')
+def date_index(star):
+    return DateIndex(star.sales['Date'])
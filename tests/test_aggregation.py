@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.aggregation import GroupBy, _distinct_per_group, aggregate
+
+SIZES = {'Product': 4, 'Region': 3, 'CustomerID': 50}
+
+
+@pytest.fixture(scope='module')
+def table():
+    rng = np.random.default_rng(0)
+    n = 2000
+    return {
+        'Product': rng.integers(0, 4, n),
+        'Region': rng.integers(0, 3, n),
+        'CustomerID': rng.integers(0, 50, n),
+        'Revenue': rng.uniform(0, 100, n),
+    }
+
+
+def reference(table, rows, keys, metrics):
+    # pandas groupby over the selected rows, reindexed to every key
+    # combination so empty groups read as zero
+    frame = pd.DataFrame(table).iloc[rows]
+    keys = list(keys)
+    if len(keys) > 1:
+        full = pd.MultiIndex.from_product([range(SIZES[key]) for key in keys], names=keys)
+    else:
+        full = pd.RangeIndex(SIZES[keys[0]]) if keys else None
+    result = {}
+    for name, how, column in metrics:
+        if not keys:
+            values = {'sum': lambda: frame[column].sum(), 'count': lambda: len(frame),
+                      'mean': lambda: frame[column].mean() if len(frame) else 0.0,
+                      'nunique': lambda: frame[column].nunique()}[how]()
+            result[name] = np.array([values])
+            continue
+        grouped = frame.groupby(keys)
+        series = grouped.size() if how == 'count' else getattr(grouped[column], how)()
+        result[name] = series.reindex(full, fill_value=0).to_numpy()
+    return result
+
+
+METRICS = (('Revenue', 'sum', 'Revenue'), ('Orders', 'count', None),
+           ('Average', 'mean', 'Revenue'), ('Customers', 'nunique', 'CustomerID'))
+
+
+@pytest.mark.parametrize('rows', [slice(0, 2000), slice(137, 1501), slice(5, 5),
+                                  np.sort(np.random.default_rng(1).choice(2000, 300, replace=False))])
+def test_matches_pandas(table, rows):
+    specs = [GroupBy((), METRICS), GroupBy(('Product',), METRICS), GroupBy(('Product', 'Region'), METRICS)]
+    for spec, result in zip(specs, aggregate(table, SIZES, specs, rows)):
+        expected = reference(table, rows, spec.keys, spec.metrics)
+        for name in expected:
+            np.testing.assert_allclose(result[name], expected[name], err_msg=f'{spec.keys} {name}')
+
+
+def test_derived_column(table):
+    columns = dict(table, Double=lambda rows: table['Revenue'][rows] * 2)
+    spec = GroupBy(('Region',), (('Double', 'sum', 'Double'),))
+    result, = aggregate(columns, SIZES, [spec], slice(0, 2000))
+    expected = reference(table, slice(0, 2000), ('Region',), (('Revenue', 'sum', 'Revenue'),))['Revenue']
+    np.testing.assert_allclose(result['Double'], 2 * expected)
+
+
+def test_rejects_unknown_metric():
+    with pytest.raises(ValueError):
+        GroupBy((), (('x', 'median', 'Revenue'),))
+
+
+@pytest.mark.parametrize('n_items', [50, 10**7])
+def test_distinct_per_group_both_paths(n_items):
+    # Small item ranges take the bitmap path, huge ones the sort path
+    rng = np.random.default_rng(2)
+    code = rng.integers(0, 6, 5000)
+    items = rng.integers(0, 50, 5000) * (n_items // 50)
+    expected = pd.Series(items).groupby(code).nunique().reindex(range(6), fill_value=0).to_numpy()
+    np.testing.assert_array_equal(_distinct_per_group(code, items, 6, n_items), expected)
+    np.testing.assert_array_equal(_distinct_per_group(code, items, 6), expected)
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).resolve().parent.parent / 'ecommerce_app.py')
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # A short trend limit so the weekly trend offers the "Show every point" toggle
+    monkeypatch.setenv('ECOM_MAX_TREND_POINTS', '30')
+    at = AppTest.from_file(APP, default_timeout=300).run()
+    assert not at.exception
+    return at
+
+
+def switch_tab(at, name):
+    at.session_state['active_tab'] = name
+    at.run()
+    assert not at.exception
+
+
+def test_trend_choices_survive_tab_switch(app):
+    app.radio(key='time_group').set_value('Weekly').run()
+    app.toggle(key='trend_every_point').set_value(True).run()
+
+    switch_tab(app, "Product Analysis")
+    assert not app.get('radio')
+    switch_tab(app, "Sales Overview")
+
+    assert app.radio(key='time_group').value == 'Weekly'
+    assert app.toggle(key='trend_every_point').value is True
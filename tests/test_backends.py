@@ -0,0 +1,158 @@
+import datetime
+import importlib
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import storage
+from analytics.backends import MemoryBackend
+from analytics.cube import DailyCube
+from analytics.filter_cache import LRUCache
+from analytics.indexes import BitmapIndex
+from analytics.rollups import RevenuePrefixSums
+from analytics.time_buckets import FREQUENCIES
+
+DIMENSIONS = ['Category', 'Product', 'Region', 'LoyaltyTier', 'Gender']
+# (start, end, selections). The second range holds all of ISO week
+# 2020-W53, which runs from 28 December to 3 January
+FILTERS = [
+    (None, None, {}),
+    (datetime.date(2020, 12, 24), datetime.date(2021, 1, 6), {}),
+    (datetime.date(2020, 12, 10), datetime.date(2021, 1, 2), {'Category': ['Electronics'], 'Region': ['North', 'East']}),
+    (datetime.date(2021, 1, 10), datetime.date(2021, 3, 1), {'Product': ['Laptop', 'Camera']}),
+    (None, None, {'Product': []}),
+    (datetime.date(2020, 12, 20), datetime.date(2021, 1, 5), {'Region': []}),
+]
+CALLS = (
+    [('total', measure) for measure in ['Revenue', 'Quantity', 'Discount', 'Orders']]
+    + [('by', dimension) for dimension in DIMENSIONS]
+    + [('distinct_customers',), ('distinct_customers', True)]
+    + [('distinct_customers_by', dimension) for dimension in DIMENSIONS]
+    + [('trend', freq) for freq in FREQUENCIES]
+    + [('customers',)]
+    + [('customer_distribution', attribute) for attribute in ['Age', 'Gender', 'LoyaltyTier']]
+)
+
+
+def memory_backend(star, date_index, **_):
+    cube = DailyCube(star, date_index)
+    return MemoryBackend(star, date_index, BitmapIndex(star.sales, ['Category', 'Product', 'Region']), cube,
+                         RevenuePrefixSums(cube), sketches=lambda: cube.customer_sketches(star, 12),
+                         sketch_precision=12, cache=LRUCache(2 ** 24))
+
+
+def engine_backend(module, source):
+    def build(tables, data_dir, config, **_):
+        pytest.importorskip(module.split('_')[0])
+        backend = next(value for name, value in vars(importlib.import_module(f'analytics.backends.{module}')).items()
+                       if name.endswith('Backend') and name != 'QueryBackend')
+        return backend.from_frames(*tables) if source == 'frames' else backend.from_parquet(data_dir, config)
+    return build
+
+
+BACKENDS = {
+    'memory': memory_backend,
+    'duckdb-frames': engine_backend('duckdb_backend', 'frames'),
+    'duckdb-parquet': engine_backend('duckdb_backend', 'parquet'),
+    'polars-frames': engine_backend('polars_backend', 'frames'),
+    'polars-parquet': engine_backend('polars_backend', 'parquet'),
+}
+
+
+@pytest.fixture(scope='module')
+def data_dir(tmp_path_factory, config, tables):
+    path = str(tmp_path_factory.mktemp('data'))
+    storage.write_tables(path, replace(config, data_dir=path), *tables)
+    return path
+
+
+@pytest.fixture(scope='module', params=list(BACKENDS))
+def backend(request, star, date_index, tables, data_dir, config):
+    return BACKENDS[request.param](star=star, date_index=date_index, tables=tables, data_dir=data_dir,
+                                   config=replace(config, data_dir=data_dir))
+
+
+def reference(merged, customers, flt, call):
+    """Answer ``call`` with a pandas groupby over the merged rows."""
+    days = merged['Date'].dt.normalize()
+    mask = (days >= pd.Timestamp(flt.start)) & (days <= pd.Timestamp(flt.end))
+    for name, values in flt.selected().items():
+        mask &= merged[name].isin(values)
+    rows = merged[mask]
+    method, args = call[0], call[1:]
+    if method == 'total':
+        return len(rows) if args[0] == 'Orders' else rows[args[0]].astype(np.float64).sum()
+    if method == 'by':
+        return rows.groupby(args[0], observed=True).agg(
+            Revenue=('Revenue', 'sum'), Quantity=('Quantity', 'sum'),
+            Discount=('Discount', 'mean'), Orders=('Revenue', 'size')).reset_index()
+    if method == 'distinct_customers':
+        return rows['CustomerID'].nunique()
+    if method == 'distinct_customers_by':
+        return rows.groupby(args[0], observed=True)['CustomerID'].nunique()
+    if method == 'trend':
+        period = {'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q'}[args[0]]
+        revenue = rows['Revenue'].astype(np.float64).groupby(days[mask]).sum()
+        daily = revenue.reindex(pd.date_range(flt.start, flt.end), fill_value=0.0)
+        grouped = daily.groupby(daily.index.to_period(period))
+        return pd.DataFrame({'Date': grouped.sum().index.start_time, 'Revenue': grouped.sum().to_numpy()})
+    active = customers[customers['CustomerID'].isin(rows['CustomerID'])].reset_index(drop=True)
+    if method == 'customers':
+        return active
+    counts = active[args[0]].value_counts(sort=False)
+    return counts if isinstance(counts.index, pd.CategoricalIndex) else counts.sort_index()
+
+
+def plain(frame):
+    # Categoricals as strings, since engines differ in which categories
+    # they carry along
+    frame = frame.reset_index(drop=True)
+    return frame.assign(**{name: column.astype(str) for name, column in frame.items()
+                           if isinstance(column.dtype, pd.CategoricalDtype)})
+
+
+@pytest.mark.parametrize('start, end, selections', FILTERS)
+def test_batch_matches_groupby(backend, merged, tables, start, end, selections):
+    flt = backend.filter(start, end, selections)
+    results = backend.batch(flt, CALLS)
+    assert set(results) == set(CALLS)
+    for call in CALLS:
+        result, expected = results[call], reference(merged, tables[1], flt, call)
+        method = call[0]
+        if call == ('distinct_customers', True):
+            error = backend.approximate_error()
+            assert abs(result - expected) <= 3 * error * expected, call
+        elif method == 'total':
+            assert result == pytest.approx(expected, rel=1e-6, abs=1e-6), call
+        elif method == 'distinct_customers':
+            assert result == expected, call
+        elif method == 'by':
+            pd.testing.assert_frame_equal(plain(result), plain(expected), check_dtype=False, rtol=1e-6,
+                                          obj=str(call))
+        elif method == 'distinct_customers_by':
+            counts = {str(key): value for key, value in result.items() if value}
+            assert counts == {str(key): value for key, value in expected.items()}, call
+        elif method == 'trend':
+            dates = result['Date'].to_numpy()
+            np.testing.assert_array_equal(dates, expected['Date'].to_numpy().astype(dates.dtype))
+            np.testing.assert_allclose(result['Revenue'].to_numpy(), expected['Revenue'].to_numpy(),
+                                       rtol=1e-6, atol=1e-6)
+        elif method == 'customers':
+            pd.testing.assert_frame_equal(plain(result.sort_values('CustomerID')), plain(expected), check_dtype=False)
+        else:
+            assert result.to_dict() == expected.to_dict(), call
+            assert result.name == 'count' and result.index.name == call[1]
+
+
+def test_week_labels_cross_new_year(backend):
+    trend = backend.trend(backend.filter(datetime.date(2020, 12, 24), datetime.date(2021, 1, 6)), 'week')
+    assert list(trend['Label']) == ['2020-W52', '2020-W53', '2021-W01']
+    assert list(trend['Date'].dt.strftime('%Y-%m-%d')) == ['2020-12-21', '2020-12-28', '2021-01-04']
+
+
+def test_options_and_bounds_agree(backend, tables):
+    sales = tables[0]
+    assert backend.options() == {name: list(sales[name].cat.categories) for name in ['Category', 'Product', 'Region']}
+    assert backend.date_bounds() == (sales['Date'].iloc[0].date(), sales['Date'].iloc[-1].date())
@@ -0,0 +1,21 @@
+import pytest
+
+from analytics.config import load_config
+
+
+@pytest.mark.parametrize('value, expected', [('1', True), ('Yes', True), (' on ', True), ('TRUE', True),
+                                             ('0', False), ('no', False), ('off', False), ('False', False)])
+def test_bool_spellings(value, expected):
+    assert load_config(environ={'ECOM_SNAPSHOT': value}).snapshot is expected
+
+
+def test_bool_typo_raises():
+    with pytest.raises(ValueError, match='snapshot'):
+        load_config(environ={'ECOM_SNAPSHOT': 'flase'})
+
+
+def test_toml_bools(tmp_path):
+    path = tmp_path / 'ecom.toml'
+    path.write_text('[data]\nshared_memory = true\nsnapshot = false\n')
+    config = load_config(path, environ={})
+    assert config.shared_memory is True and config.snapshot is False
@@ -0,0 +1,70 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.cube import DailyCube
+from analytics.time_buckets import FREQUENCIES
+
+# (start, end, selections), including a range across New Year, one past
+# the data and a selection that matches nothing
+QUERIES = [
+    (None, None, None),
+    (datetime.date(2020, 12, 24), datetime.date(2021, 1, 6), {}),
+    (datetime.date(2020, 12, 10), datetime.date(2021, 1, 2), {'Category': ['Electronics'], 'Region': ['North', 'East']}),
+    (None, None, {'LoyaltyTier': ['Gold'], 'Gender': ['Female']}),
+    (datetime.date(2021, 1, 10), datetime.date(2021, 3, 1), {'Product': ['Laptop', 'Camera']}),
+    (None, None, {'Product': []}),
+]
+
+
+@pytest.fixture(scope='module')
+def cube(star, date_index):
+    return DailyCube(star, date_index)
+
+
+def matching(merged, start, end, selections):
+    days = merged['Date'].dt.normalize()
+    mask = pd.Series(True, index=merged.index)
+    if start is not None:
+        mask &= (days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end))
+    for name, values in (selections or {}).items():
+        mask &= merged[name].isin(values)
+    return merged[mask]
+
+
+@pytest.mark.parametrize('start, end, selections', QUERIES)
+def test_totals_match_rows(cube, merged, start, end, selections):
+    view = cube.query(start, end, selections)
+    rows = matching(merged, start, end, selections)
+    for measure in ['Revenue', 'Quantity', 'Discount']:
+        assert view.total(measure) == pytest.approx(rows[measure].astype(np.float64).sum(), rel=1e-9, abs=1e-6)
+    assert view.total('Orders') == len(rows)
+
+
+@pytest.mark.parametrize('start, end, selections', QUERIES)
+@pytest.mark.parametrize('dimension', ['Category', 'Product', 'Region', 'LoyaltyTier', 'Gender'])
+def test_by_matches_groupby(cube, merged, start, end, selections, dimension):
+    rows = matching(merged, start, end, selections)
+    expected = rows.groupby(dimension, observed=True).agg(
+        Revenue=('Revenue', 'sum'), Quantity=('Quantity', 'sum'),
+        Discount=('Discount', 'mean'), Orders=('Revenue', 'size')).reset_index()
+    result = cube.query(start, end, selections).by(dimension)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False, rtol=1e-6)
+
+
+@pytest.mark.parametrize('start, end, selections', QUERIES)
+@pytest.mark.parametrize('freq', FREQUENCIES)
+def test_by_period_matches_groupby(cube, merged, start, end, selections, freq):
+    rows = matching(merged, start, end, selections)
+    periods = rows['Date'].dt.to_period({'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q'}[freq])
+    expected = rows['Revenue'].astype(np.float64).groupby(periods.dt.start_time).sum()
+    result = cube.query(start, end, selections).by_period(freq)
+    np.testing.assert_array_equal(result['Date'].to_numpy(), expected.index.to_numpy().astype(result['Date'].dtype))
+    np.testing.assert_allclose(result['Revenue'].to_numpy(), expected.to_numpy(), rtol=1e-9)
+    if freq == 'week':
+        # ISO weeks are labelled by their ISO year, so 2020-W53 keeps
+        # January 2021's days
+        iso = expected.index.isocalendar()
+        assert list(result['Label']) == [f'{year}-W{week:02d}' for year, week in zip(iso['year'], iso['week'])]
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.downsample import lttb_indices
+
+
+def reference_lttb(x, y, n_out):
+    # Straight transcription of Steinarsson's LTTB, one bucket at a time
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    kept = [0]
+    previous = 0
+    for i in range(n_out - 2):
+        next_start = math.floor((i + 1) * every) + 1
+        next_stop = min(math.floor((i + 2) * every) + 1, n)
+        mean_x = x[next_start:next_stop].mean()
+        mean_y = y[next_start:next_stop].mean()
+        start = math.floor(i * every) + 1
+        stop = math.floor((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((x[previous] - mean_x) * (y[j] - y[previous]) - (x[previous] - x[j]) * (mean_y - y[previous]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        previous = best
+    kept.append(n - 1)
+    return np.array(kept)
+
+
+@pytest.mark.parametrize('n, n_out', [(10, 3), (100, 7), (1000, 100), (1001, 999), (5000, 1000)])
+def test_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 1000, n))
+    y = rng.normal(size=n).cumsum()
+    np.testing.assert_array_equal(lttb_indices(x, y, n_out), reference_lttb(x, y, n_out))
+
+
+def test_datetime_x():
+    dates = pd.date_range('2023-01-01', periods=730)
+    y = np.sin(np.arange(730) / 20.0)
+    expected = reference_lttb(dates.asi8.astype(np.float64), y, 50)
+    np.testing.assert_array_equal(lttb_indices(dates, y, 50), expected)
+    np.testing.assert_array_equal(lttb_indices(dates.to_numpy(), y, 50), expected)
+
+
+@pytest.mark.parametrize('n_out', [0, 2, 10, 11])
+def test_keeps_everything_when_not_shrinking(n_out):
+    np.testing.assert_array_equal(lttb_indices(np.arange(10), np.arange(10), n_out), np.arange(10))
+
+
+def test_keeps_spike():
+    y = np.zeros(1000)
+    y[517] = 100
+    assert 517 in lttb_indices(np.arange(1000), y, 20)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.histograms import integer_bins
+
+
+def counts_of(values):
+    return pd.Series(values).value_counts().sort_index()
+
+
+@pytest.mark.parametrize('values, n_bins', [
+    (np.random.default_rng(0).integers(18, 80, 5000), 20),
+    (np.random.default_rng(1).integers(18, 80, 500), 7),
+    (np.arange(18, 38), 20),
+    (np.array([30, 30, 30]), 20),
+    (np.array([18, 90]), 20),
+])
+def test_bins_match_reference(values, n_bins):
+    counts = counts_of(values)
+    bins = integer_bins(counts, n_bins)
+    lo, hi = values.min(), values.max()
+    widths = bins['End'] - bins['Start'] + 1
+    assert len(bins) <= n_bins
+    assert widths.nunique() == 1
+    assert bins['Start'].iloc[0] == lo and bins['End'].iloc[-1] >= hi
+    assert (bins['Start'].iloc[1:].to_numpy() == bins['End'].iloc[:-1].to_numpy() + 1).all()
+    expected = [int(((values >= start) & (values <= end)).sum()) for start, end in zip(bins['Start'], bins['End'])]
+    assert bins['count'].tolist() == expected
+
+
+def test_labels():
+    bins = integer_bins(counts_of(np.arange(20, 60)), 20)
+    assert bins['Label'].iloc[0] == '20–21'
+    assert integer_bins(counts_of(np.arange(20, 25)), 20)['Label'].tolist() == ['20', '21', '22', '23', '24']
+
+
+def test_empty():
+    assert len(integer_bins(pd.Series([], dtype=np.int64))) == 0
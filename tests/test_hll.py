@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from analytics.cube import DailyCube
+from analytics.hll import SketchBank, estimate, precision_for_error, standard_error
+
+
+@pytest.mark.parametrize('precision', [6, 10, 12, 14])
+@pytest.mark.parametrize('n_items', [50, 2_000, 100_000])
+def test_estimate_within_standard_error(precision, n_items):
+    rng = np.random.default_rng(precision * n_items)
+    items = rng.choice(np.iinfo(np.int64).max, n_items, replace=False)
+    # Every item twice, so repeats are seen to be ignored
+    bank = SketchBank.build(np.zeros(2 * n_items, dtype=np.int64), 1, np.tile(items, 2), precision)
+    assert abs(bank.count(np.array([0])) - n_items) <= 3 * standard_error(precision) * n_items
+
+
+def test_union_of_groups_equals_one_sketch():
+    rng = np.random.default_rng(0)
+    items = rng.integers(0, 30_000, 200_000)
+    groups = rng.integers(0, 500, len(items))
+    bank = SketchBank.build(groups, 500, items, 12)
+    whole = SketchBank.build(np.zeros(len(items), dtype=np.int64), 1, items, 12)
+    np.testing.assert_array_equal(bank.union(np.arange(500)), whole.registers[0])
+
+    # A subset of groups unions to the sketch of just their items
+    chosen = np.arange(0, 500, 7)
+    rows = np.isin(groups, chosen)
+    part = SketchBank.build(np.zeros(rows.sum(), dtype=np.int64), 1, items[rows], 12)
+    np.testing.assert_array_equal(bank.union(chosen), part.registers[0])
+    assert bank.count(chosen) == int(np.rint(estimate(part.registers[0])))
+
+
+def test_count_by_matches_per_key_union():
+    rng = np.random.default_rng(1)
+    items = rng.integers(0, 5_000, 20_000)
+    bank = SketchBank.build(rng.integers(0, 40, len(items)), 40, items, 10)
+    positions = np.arange(40)
+    keys = positions % 3
+    counts = bank.count_by(positions, keys, 4)
+    assert list(counts) == [bank.count(positions[keys == key]) for key in range(3)] + [0]
+    assert bank.count(np.array([], dtype=np.int64)) == 0
+
+
+def test_cell_sketches_union_to_global_sketch(star, date_index):
+    sketches = DailyCube(star, date_index).customer_sketches(star, 12)
+    customers = star.sales['CustomerID'].to_numpy()
+    whole = SketchBank.build(np.zeros(len(customers), dtype=np.int64), 1, customers, 12)
+    np.testing.assert_array_equal(sketches.bank.union(np.arange(len(sketches.bank.registers))), whole.registers[0])
+
+
+@pytest.mark.parametrize('error', [0.2, 0.05, 0.01])
+def test_precision_for_error(error):
+    precision = precision_for_error(error)
+    assert standard_error(precision) <= error < standard_error(precision - 1)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.indexes import BitmapIndex, DateIndex
+
+
+@pytest.fixture(scope='module')
+def dates():
+    # Sorted timestamps with gaps, several orders on some days and none on others
+    rng = np.random.default_rng(0)
+    days = np.sort(rng.choice(pd.date_range('2023-01-01', '2023-03-31').to_numpy(), 400))
+    return pd.Series(days + rng.integers(0, 86_400, 400).astype('timedelta64[s]')).sort_values(ignore_index=True)
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2023-01-01', '2023-03-31'),
+    ('2023-01-15', '2023-01-15'),
+    ('2022-12-01', '2023-01-10'),
+    ('2023-03-20', '2023-05-01'),
+    ('2022-01-01', '2022-02-01'),
+    ('2023-02-10', '2023-02-01'),
+])
+def test_slice_matches_mask(dates, start, end):
+    index = DateIndex(dates)
+    days = dates.dt.normalize()
+    mask = ((days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end))).to_numpy()
+    rows = index.slice(pd.Timestamp(start).date(), pd.Timestamp(end).date())
+    np.testing.assert_array_equal(np.arange(len(dates))[rows], np.flatnonzero(mask))
+
+
+def test_rejects_unsorted():
+    with pytest.raises(ValueError):
+        DateIndex(pd.Series(pd.to_datetime(['2023-01-02', '2023-01-01'])))
+
+
+@pytest.fixture(scope='module')
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Product': rng.choice(['Laptop', 'Tablet', 'Monitor'], 101),
+        'Region': rng.choice(['North', 'South', 'East', 'West'], 101),
+    })
+
+
+SELECTIONS = [
+    {'Product': ['Tablet']},
+    {'Product': ['Laptop', 'Monitor'], 'Region': ['East']},
+    {'Region': ['North', 'West', 'South']},
+]
+# Starts and stops on, just before and just after byte boundaries
+EDGES = [0, 1, 7, 8, 9, 15, 16, 17, 63, 64, 65, 99, 100, 101]
+
+
+@pytest.mark.parametrize('selections', SELECTIONS)
+def test_select_matches_mask(frame, selections):
+    index = BitmapIndex(frame, ['Product', 'Region'])
+    mask = np.logical_and.reduce([frame[name].isin(values).to_numpy() for name, values in selections.items()])
+    for start in EDGES:
+        for stop in EDGES:
+            if stop < start:
+                continue
+            rows = index.select(selections, slice(start, stop))
+            np.testing.assert_array_equal(rows, np.flatnonzero(mask[start:stop]) + start)
+
+
+def test_unrestricted_returns_slice(frame):
+    index = BitmapIndex(frame, ['Product', 'Region'])
+    rows = slice(9, 65)
+    assert index.select({'Product': ['Laptop', 'Tablet', 'Monitor']}, rows) is rows
+    assert index.select({}, rows) is rows
+
+
+def test_empty_selection(frame):
+    index = BitmapIndex(frame, ['Product', 'Region'])
+    assert len(index.select({'Region': []})) == 0
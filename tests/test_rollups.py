@@ -0,0 +1,58 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.cube import DailyCube
+from analytics.rollups import RevenuePrefixSums
+from analytics.time_buckets import FREQUENCIES
+
+QUERIES = [
+    (None, None, None),
+    (datetime.date(2020, 12, 24), datetime.date(2021, 1, 6), {}),
+    (datetime.date(2020, 12, 10), datetime.date(2021, 1, 2), {'Category': ['Electronics'], 'Region': ['North', 'East']}),
+    (datetime.date(2020, 11, 1), datetime.date(2020, 12, 3), {'Product': ['Tablet']}),
+    (datetime.date(2021, 1, 10), datetime.date(2021, 3, 1), {'Product': ['Laptop', 'Camera']}),
+    (None, None, {'Region': []}),
+    (datetime.date(2021, 1, 9), datetime.date(2021, 1, 8), {}),
+]
+
+
+@pytest.fixture(scope='module')
+def prefix(star, date_index):
+    return RevenuePrefixSums(DailyCube(star, date_index))
+
+
+def daily_revenue(sales, start, end, selections):
+    # Revenue of every day of the range that has data, zero where nothing matched
+    first, last = sales['Date'].iloc[0].normalize(), sales['Date'].iloc[-1].normalize()
+    days = pd.date_range(max(pd.Timestamp(start or first), first), min(pd.Timestamp(end or last), last))
+    mask = pd.Series(True, index=sales.index)
+    for name, values in (selections or {}).items():
+        mask &= sales[name].isin(values)
+    rows = sales[mask]
+    revenue = rows['Revenue'].astype(np.float64).groupby(rows['Date'].dt.normalize()).sum()
+    return revenue.reindex(days, fill_value=0.0)
+
+
+@pytest.mark.parametrize('start, end, selections', QUERIES)
+def test_total_matches_rows(prefix, tables, start, end, selections):
+    expected = daily_revenue(tables[0], start, end, selections).sum()
+    assert prefix.total(start, end, selections) == pytest.approx(expected, rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize('start, end, selections', QUERIES)
+@pytest.mark.parametrize('freq', FREQUENCIES)
+def test_trend_matches_rows(prefix, tables, start, end, selections, freq):
+    daily = daily_revenue(tables[0], start, end, selections)
+    periods = daily.index.to_period({'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q'}[freq])
+    expected = daily.groupby(periods.start_time).sum()
+    result = prefix.trend(start, end, selections, freq)
+    np.testing.assert_array_equal(result['Date'].to_numpy(), expected.index.to_numpy().astype('datetime64[us]'))
+    np.testing.assert_allclose(result['Revenue'].to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-6)
+
+
+def test_rejects_customer_filters(prefix):
+    with pytest.raises(ValueError):
+        prefix.total(selections={'LoyaltyTier': ['Gold']})
@@ -0,0 +1,65 @@
+import fcntl
+import logging
+import time
+import uuid
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import shared_store
+
+
+@pytest.fixture
+def name():
+    name = f'ecom-test-{uuid.uuid4().hex[:12]}'
+    yield name
+    shared_store._unlink_table(name)
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'Revenue': np.arange(1000, dtype=np.float64),
+        'Region': pd.Categorical(np.tile(['North', 'South'], 500)),
+    })
+
+
+def orphan(name, manifest=False):
+    # Segments as a publisher that died half way leaves them
+    shared_store._create(name, 4096).close()
+    if manifest:
+        shared_store._create(f'{name}-manifest', 64).close()
+
+
+def test_publish_then_attach(name, frame):
+    published = shared_store._publish_table(name, frame)
+    pd.testing.assert_frame_equal(published, frame)
+    pd.testing.assert_frame_equal(shared_store._attach_table(name), frame)
+
+
+@pytest.mark.parametrize('manifest', [False, True])
+def test_orphaned_segments_are_replaced(name, frame, manifest):
+    orphan(name, manifest)
+    assert shared_store._attach_table(name) is None
+
+    started = time.monotonic()
+    published = shared_store._publish_table(name, frame)
+    assert time.monotonic() - started < 1
+    pd.testing.assert_frame_equal(published, frame)
+    # The replacement is the shared copy, not a private one
+    assert not published['Revenue'].to_numpy().flags.writeable
+    pd.testing.assert_frame_equal(shared_store._attach_table(name), frame)
+
+
+def test_busy_publisher_falls_back_with_warning(name, frame, monkeypatch, caplog):
+    monkeypatch.setattr(shared_store, '_PUBLISH_TIMEOUT', 0.2)
+    with open(shared_store._lock_path(name), 'a') as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        with caplog.at_level(logging.WARNING, logger=shared_store.__name__):
+            result = shared_store._publish_table(name, frame)
+    assert result is frame
+    assert 'private copy' in caplog.text
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
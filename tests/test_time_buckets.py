@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.time_buckets import bucket_sums, epoch_days, period_labels, period_codes, range_sums
+
+
+def reference_period(day, freq):
+    # (label, first day) of the period holding ``day``, the slow obvious way
+    if freq == 'day':
+        return day.strftime('%Y-%m-%d'), day
+    if freq == 'week':
+        iso = day.isocalendar()
+        return f'{iso.year}-W{iso.week:02d}', day - pd.Timedelta(days=day.weekday())
+    if freq == 'month':
+        return day.strftime('%Y-%m'), day.replace(day=1)
+    quarter = (day.month - 1) // 3
+    return f'{day.year}-Q{quarter + 1}', day.replace(month=3 * quarter + 1, day=1)
+
+
+def reference_sums(days, values, freq):
+    periods = [reference_period(day, freq) for day in days]
+    frame = pd.DataFrame({'Label': [label for label, _ in periods],
+                          'Date': [start for _, start in periods],
+                          'Value': values})
+    return frame.groupby(['Label', 'Date'], sort=False, as_index=False)['Value'].sum()
+
+
+FREQUENCIES = ['day', 'week', 'month', 'quarter']
+
+
+@pytest.mark.parametrize('freq', FREQUENCIES)
+def test_range_sums_across_new_year(freq):
+    # Covers 2020-W53 and ISO years that differ from the calendar year
+    days = pd.date_range('2019-12-20', '2021-02-10')
+    values = np.random.default_rng(0).uniform(0, 100, len(days))
+    values[40:70] = 0
+    result = range_sums(epoch_days(days[0]), values, freq)
+    expected = reference_sums(days, values, freq)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('freq', FREQUENCIES)
+def test_bucket_sums_skips_empty_periods(freq):
+    rng = np.random.default_rng(1)
+    days = pd.DatetimeIndex(np.sort(rng.choice(pd.date_range('2014-12-01', '2016-02-01').to_numpy(), 60)))
+    values = rng.uniform(0, 100, len(days))
+    result = bucket_sums(epoch_days(days), values, freq)
+    expected = reference_sums(days, values, freq)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('day, label', [
+    ('2018-12-31', '2019-W01'),
+    ('2021-01-03', '2020-W53'),
+    ('2021-01-04', '2021-W01'),
+    ('2027-01-01', '2026-W53'),
+])
+def test_iso_week_labels(day, label):
+    codes = period_codes(epoch_days([np.datetime64(day)]), 'week')
+    assert period_labels(codes, 'week') == [label]
+
+
+def test_empty():
+    for freq in FREQUENCIES:
+        assert len(range_sums(0, [], freq)) == 0
+        assert len(bucket_sums([], [], freq)) == 0